@@ -1,6 +1,13 @@
+import sys
 import random
+import argparse
+import multiprocessing
 
 SHAPES = ['Q', 'Z', 'S', 'T', 'I', 'L', 'J']
+SHAPE_WIDTHS = {'Q': 2, 'Z': 3, 'S': 3, 'T': 3, 'I': 4, 'L': 2, 'J': 2}
+
+# Every piece that stays inside the grid, e.g. 'Q0' ... 'Q8'
+VALID_PIECES = [f"{shape}{col}" for shape in SHAPES for col in range(11 - SHAPE_WIDTHS[shape])]
 
 def generate_max_height_test():
     """
@@ -109,7 +116,119 @@ def generate_invalid_input_test():
     test_pieces.append("S5")
     return ','.join(test_pieces)
 
-def main():
+# Streaming workloads for large benchmarks. A line of N pieces is cut into
+# shards of SHARD_PIECES; every shard draws from its own Random seeded by
+# (seed, stream, shard), so the output is the same for any number of jobs
+# and any shard can be produced without generating the ones before it.
+# Shards are generated in worker processes and written in order through a
+# large file buffer, so no line is ever held in memory whole.
+SHARD_PIECES = 1 << 18
+WRITE_BUFFER_BYTES = 1 << 22
+
+WORKLOADS = ['random', 'clear-heavy', 'tall-sparse', 'periodic', 'prefix-sharing']
+
+# Groups of pieces that fill exactly two rows in any drop order, so every
+# group clears twice and leaves the board empty
+CLEAR_UNITS = [
+    ['Q0', 'Q2', 'Q4', 'Q6', 'Q8'],
+    ['Q0', 'I2', 'I6', 'I2', 'I6'],
+    ['Q4', 'I0', 'I6', 'I0', 'I6'],
+    ['Q8', 'I0', 'I4', 'I0', 'I4'],
+]
+UNIT_PIECES = 5  # Every clear unit has five pieces
+
+# Narrow pieces in columns 0-1, 4-5 and 8-9 only: no row can ever fill
+SPARSE_PIECES = [f"{shape}{col}" for shape in ('Q', 'L', 'J') for col in (0, 4, 8)]
+
+def shard_rng(seed, stream, shard):
+    return random.Random(f"{seed}/{stream}/{shard}")
+
+def periodic_pattern(seed, stream):
+    """
+    Returns the repeating unit of a periodic line: 2 to 64 random pieces.
+    """
+    rng = shard_rng(seed, stream, 'pattern')
+    return rng.choices(VALID_PIECES, k=rng.randint(2, 64))
+
+def generate_shard(workload, seed, stream, shard, count):
+    """
+    Generates pieces shard * SHARD_PIECES onwards of one piece stream, as
+    comma-separated text.
+    """
+    rng = shard_rng(seed, stream, shard)
+    if workload == 'clear-heavy':
+        # Units run end to end through the whole stream and are drawn from
+        # the shard's own stream, except that a unit split by a shard
+        # boundary is always the first one, unshuffled, so the shards on
+        # either side agree on it and the board is empty after it
+        head = -shard * SHARD_PIECES % UNIT_PIECES
+        pieces = CLEAR_UNITS[0][UNIT_PIECES - head:][:count] if head else []
+        while count - len(pieces) >= UNIT_PIECES:
+            unit = rng.choice(CLEAR_UNITS)[:]
+            rng.shuffle(unit)
+            pieces.extend(unit)
+        if count > len(pieces):
+            pieces.extend(CLEAR_UNITS[0][:count - len(pieces)])
+    elif workload == 'tall-sparse':
+        pieces = rng.choices(SPARSE_PIECES, k=count)
+    elif workload == 'periodic':
+        pattern = periodic_pattern(seed, stream)
+        offset = shard * SHARD_PIECES % len(pattern)
+        repeats = (offset + count) // len(pattern) + 1
+        pieces = (pattern * repeats)[offset:offset + count]
+    else:
+        pieces = rng.choices(VALID_PIECES, k=count)
+    return ','.join(pieces)
+
+def shard_tasks(workload, seed, pieces, lines, shared):
+    """
+    Yields (workload, seed, stream, shard, count) for every shard, in output
+    order, with None after the last shard of each line.
+    """
+    prefix = int(pieces * shared) if workload == 'prefix-sharing' else 0
+    for line in range(lines):
+        # prefix-sharing lines start with the same stream, then diverge
+        for stream, length in (('prefix', prefix), (f"line{line}", pieces - prefix)):
+            for shard in range(0, (length + SHARD_PIECES - 1) // SHARD_PIECES):
+                count = min(SHARD_PIECES, length - shard * SHARD_PIECES)
+                yield (workload, seed, stream, shard, count)
+        yield None
+
+def run_shard(task):
+    return None if task is None else generate_shard(*task)
+
+def write_workload(path, workload, seed=0, pieces=1000000, lines=1, shared=0.9, jobs=1):
+    """
+    Streams a workload to path (or stdout for '-'), one game per line.
+    """
+    tasks = shard_tasks(workload, seed, pieces, lines, shared)
+    out = sys.stdout.buffer if path == '-' else open(path, 'wb', buffering=WRITE_BUFFER_BYTES)
+    pool = multiprocessing.Pool(jobs) if jobs > 1 else None
+    try:
+        texts = pool.imap(run_shard, tasks) if pool else map(run_shard, tasks)
+        separator = b''
+        for text in texts:
+            if text is None:
+                out.write(b'\n')
+                separator = b''
+                continue
+            if text:
+                out.write(separator)
+                out.write(text.encode())
+                separator = b','
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+
+def generate_standard_tests():
+    """
+    Writes the fixed test suite under tests/.
+    """
     # Test Case 1: Maximum Height Test
     with open('tests/test_max_height.txt', 'w') as f:
         test_case = generate_max_height_test()
@@ -157,5 +276,26 @@ def main():
 
     print("Test cases generated.")
 
+def main():
+    parser = argparse.ArgumentParser(description="Generate Tetris test inputs")
+    parser.add_argument('--workload', choices=WORKLOADS, help="Stream one large workload instead of writing the test suite under tests/")
+    parser.add_argument('--pieces', type=int, default=1000000, help="Pieces per line")
+    parser.add_argument('--lines', type=int, default=1, help="Number of lines (games)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed; the same seed always gives the same output")
+    parser.add_argument('--shared', type=float, default=0.9, help="Fraction of each line shared by all lines (prefix-sharing)")
+    parser.add_argument('--jobs', type=int, default=1, help="Generate shards in N processes (output does not depend on N)")
+    parser.add_argument('--output', default='-', help="Output file (default stdout)")
+    args = parser.parse_args()
+    if args.pieces < 1 or args.lines < 1 or args.jobs < 1:
+        parser.error("--pieces, --lines and --jobs must be positive")
+    if not 0 <= args.shared <= 1:
+        parser.error("--shared must be between 0 and 1")
+
+    if args.workload is None:
+        random.seed(args.seed)
+        generate_standard_tests()
+    else:
+        write_workload(args.output, args.workload, args.seed, args.pieces, args.lines, args.shared, args.jobs)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
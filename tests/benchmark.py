@@ -0,0 +1,195 @@
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+
+# Define paths
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))  # Path to the 'tests/' directory
+ENGINE_DIR = os.path.abspath(os.path.join(TEST_DIR, os.pardir))  # Parent directory containing 'tetris.py'
+BASELINE_FILE = os.path.join(TEST_DIR, 'benchmark_baseline.json')
+
+sys.path.insert(0, ENGINE_DIR)
+import tetris
+
+# In-process benchmark suite. Every case runs in a forked child that imports
+# the engine once, so interpreter startup never shows up in the timings and
+# the child's own maxrss is the peak RSS of that case alone. Each workload is
+# swept on a log scale and a straight line is fitted through
+# log(ns per piece) against log(size): a slope near 0 means constant work per
+# piece, a slope near 1 means work per piece grows linearly with the size.
+
+ENGINES = ['dict', 'bitboard']
+CLEAR_PIECES = 1 << 12  # Pieces timed on top of each tower in the height sweep
+
+def random_pieces(count, seed):
+    # Uniformly random valid placements
+    rng = random.Random(seed)
+    shapes = sorted(tetris.PLACEMENTS)
+    columns = {shape_letter: sorted(tetris.PLACEMENTS[shape_letter]) for shape_letter in shapes}
+    pieces = []
+    for _ in range(count):
+        shape_letter = rng.choice(shapes)
+        pieces.append((shape_letter, str(rng.choice(columns[shape_letter]))))
+    return pieces
+
+def tower_pieces(height):
+    # A two-column tower of the given height in columns 0-1
+    return [('Q', '0')] * (height // 2)
+
+def clearing_pieces(count):
+    # Two horizontal I pieces fill a row next to the tower and clear it; the
+    # Q on top regrows the tower, so its height stays constant
+    unit = [('I', '2'), ('I', '6'), ('I', '2'), ('I', '6'), ('Q', '0')]
+    return (unit * (count // len(unit) + 1))[:count]
+
+def best_time_ns(pieces, engine, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        tetris.simulate(pieces, engine=engine)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run_case(workload, engine, size, repeat, seed):
+    # Measure one case; runs inside the forked child
+    if workload == 'pieces':
+        setup = []
+        pieces = random_pieces(size, seed)
+    else:
+        setup = tower_pieces(size)
+        pieces = setup + clearing_pieces(CLEAR_PIECES)
+    measured = len(pieces) - len(setup)
+
+    elapsed = best_time_ns(pieces, engine, repeat)
+    if setup:
+        # Subtract the time spent building the tower
+        elapsed = max(elapsed - best_time_ns(setup, engine, repeat), 0)
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Allocation tracing slows the run down, so it is measured separately
+    tracemalloc.start()
+    height = tetris.simulate(pieces, engine=engine)
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'workload': workload,
+        'engine': engine,
+        'size': size,
+        'pieces': measured,
+        'height': height,
+        'ns_per_piece': elapsed / measured,
+        'peak_traced_bytes': peak_traced,
+        'peak_rss_kb': peak_rss_kb,
+    }
+
+def run_forked(*case):
+    # Run one case in a forked child and read its result back over a pipe
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            result = run_case(*case)
+        except Exception as e:
+            result = {'error': repr(e)}
+        with os.fdopen(write_fd, 'w') as pipe:
+            json.dump(result, pipe)
+        os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        data = pipe.read()
+    os.waitpid(pid, 0)
+    result = json.loads(data)
+    if 'error' in result:
+        raise RuntimeError(f"{case[0]}/{case[1]} at size {case[2]} failed: {result['error']}")
+    return result
+
+def fit_slope(cases):
+    # Least-squares slope and intercept of log2(ns per piece) over log2(size)
+    xs = [math.log2(case['size']) for case in cases]
+    ys = [math.log2(max(case['ns_per_piece'], 1e-9)) for case in cases]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+    return {'slope': slope, 'intercept': mean_y - slope * mean_x, 'points': len(cases)}
+
+def log_sizes(low, high):
+    return [1 << exponent for exponent in range(low, high + 1)]
+
+def run_suite(args):
+    sweeps = {
+        'pieces': log_sizes(args.min_pieces_log2, args.max_pieces_log2),
+        'height': log_sizes(args.min_height_log2, args.max_height_log2),
+    }
+    cases = []
+    fits = {}
+    for workload, sizes in sweeps.items():
+        for engine in args.engines:
+            curve = []
+            for size in sizes:
+                case = run_forked(workload, engine, size, args.repeat, args.seed)
+                curve.append(case)
+                print(f"{workload:>6} {engine:>8} {size:>9}: {case['ns_per_piece']:10.0f} ns/piece "
+                      f"{case['peak_traced_bytes'] / 1024:10.0f} KiB traced {case['peak_rss_kb']:8d} KB rss")
+                # Stop the sweep once a single run gets too slow
+                if case['ns_per_piece'] * case['pieces'] > args.max_seconds * 1e9:
+                    break
+            cases.extend(curve)
+            if len(curve) > 1:
+                fits[f"{workload}/{engine}"] = fit_slope(curve)
+    return {'python': sys.version.split()[0], 'cases': cases, 'fits': fits}
+
+def compare(results, baseline, tolerance):
+    # Returns the fits whose slope moved by more than the tolerance
+    regressions = []
+    for name, fit in results['fits'].items():
+        expected = baseline['fits'].get(name)
+        if expected is None:
+            continue
+        change = fit['slope'] - expected['slope']
+        status = 'REGRESSION' if change > tolerance else 'ok'
+        print(f"{name:>16}: slope {fit['slope']:+.2f} (baseline {expected['slope']:+.2f}) {status}")
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process scaling benchmarks for the Tetris engines.")
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=ENGINES, help="Engines to benchmark")
+    parser.add_argument('--min-pieces-log2', type=int, default=10, help="Smallest piece count, as a power of two")
+    parser.add_argument('--max-pieces-log2', type=int, default=17, help="Largest piece count, as a power of two")
+    parser.add_argument('--min-height-log2', type=int, default=8, help="Lowest tower height, as a power of two")
+    parser.add_argument('--max-height-log2', type=int, default=16, help="Highest tower height, as a power of two")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case; the fastest is kept")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the random piece sequences")
+    parser.add_argument('--max-seconds', type=float, default=10.0, help="Stop a sweep once one run takes longer than this")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    parser.add_argument('--save-baseline', nargs='?', const=BASELINE_FILE, metavar='PATH', help="Save the results as the baseline (default %(const)s)")
+    parser.add_argument('--compare', nargs='?', const=BASELINE_FILE, metavar='PATH', help="Compare fitted slopes against a saved baseline (default %(const)s)")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slope increase before a fit counts as a regression")
+    args = parser.parse_args()
+
+    results = run_suite(args)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+    else:
+        for name, fit in results['fits'].items():
+            print(f"{name:>16}: slope {fit['slope']:+.2f}")
+
+if __name__ == "__main__":
+    main()
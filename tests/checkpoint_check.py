@@ -0,0 +1,95 @@
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+
+# Define paths
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))  # Path to the 'tests/' directory
+ENGINE_DIR = os.path.abspath(os.path.join(TEST_DIR, os.pardir))  # Parent directory containing 'tetris.py'
+sys.path.insert(0, ENGINE_DIR)
+
+from tetris import ResultSink, parse_line, simulate_bitboard
+from tetris_checkpoint import run_games
+from tetris_verify import random_game
+
+# Checkpoint resume check. Random games, some tall enough to fold sealed
+# rows and some ending in a bad token, are played through run_games, which
+# is made to crash after a given number of pieces: mid-line, right after a
+# checkpoint and between lines. A second run resumes from the checkpoint,
+# and what the two runs flushed together must be exactly the output of an
+# uninterrupted run, with no line missing or repeated.
+
+class Crash(Exception):
+    pass
+
+def format_line(pieces):
+    return ','.join(f"{shape_letter}{column}" for shape_letter, column in pieces)
+
+def opener(lines, crash_after=None):
+    # open_games for run_games, raising Crash once crash_after pieces have
+    # been read
+    read = 0
+
+    def counted(pieces):
+        nonlocal read
+        for piece in pieces:
+            if read == crash_after:
+                raise Crash
+            read += 1
+            yield piece
+
+    def open_games(start_line):
+        for line in lines[start_line:]:
+            yield counted(parse_line(line))
+    return open_games
+
+def play(lines, path, every, crash_after):
+    # Output flushed by a run crashing after crash_after pieces plus its
+    # resumed run
+    first, second = io.BytesIO(), io.BytesIO()
+    try:
+        run_games(opener(lines, crash_after), ResultSink(first, interval=0), path, every_pieces=every)
+    except Crash:
+        pass
+    sink = ResultSink(second, interval=0)
+    run_games(opener(lines), sink, path, resume=True, every_pieces=every)
+    sink.flush()
+    return first.getvalue() + second.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that a resumed checkpoint run prints what an uninterrupted run prints.")
+    parser.add_argument('--lines', type=int, default=40, help="Games per run.")
+    parser.add_argument('--crashes', type=int, default=20, help="Crash points to try.")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    lines = [format_line(random_game(rng, rng.choice((50, 500, 5000)))) for _ in range(args.lines)]
+    expected = b''.join(b'%d\n' % simulate_bitboard(parse_line(line)) for line in lines)
+
+    # Random crash points, plus the first piece of a few lines and the piece
+    # after each of the first checkpoints
+    ends = [0]
+    for line in lines:
+        ends.append(ends[-1] + len(line.split(',')))
+    crashes = set(rng.sample(range(ends[-1]), min(args.crashes, ends[-1]))) | set(ends[1:6])
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'games.ckpt')
+        for every in (256, 4096):
+            for crash_after in sorted(crashes | {every, 2 * every}):
+                if os.path.exists(path):
+                    os.remove(path)
+                got = play(lines, path, every, crash_after)
+                if got != expected:
+                    results = got.count(b'\n')
+                    print(f"crash after {crash_after} pieces, checkpoint every {every}: {results} results, expected {len(lines)}")
+                    failures += 1
+    print(f"{len(lines)} lines, {ends[-1]} pieces, {failures} failing")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import os
+import random
+import sys
+from itertools import chain
+
+# Define paths
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))  # Path to the 'tests/' directory
+ENGINE_DIR = os.path.abspath(os.path.join(TEST_DIR, os.pardir))  # Parent directory containing 'tetris.py'
+sys.path.insert(0, ENGINE_DIR)
+
+from tetris import MOVES, PLACEMENTS, TetrisEngine, parse_line
+from test_generator import CLEAR_UNITS
+
+# What-if check for TetrisEngine.evaluate. Boards are built from random
+# moves with runs that clear rows, some tall enough to fold sealed rows
+# away, or taken from the sealed-restore test lines just before a clear
+# exposes the archive. evaluate(MOVES), plus a few rejected moves, must
+# leave the board unchanged, and every outcome must match a real drop() of
+# that move from a snapshot of the same board: status, height and column
+# profile, the landing row, and as many cleared rows as the drop removed.
+
+REJECTED = [('X', 0), ('Q', 9), ('I', 7)]  # Unknown shape, out of bounds twice
+SEALED_RESTORE = os.path.join(TEST_DIR, 'test_sealed_restore.txt')
+
+def build(rng, pieces):
+    # An engine after pieces random moves, a fifth of them clear-unit runs
+    engine = TetrisEngine()
+    while pieces > 0:
+        if rng.random() < 0.2:
+            unit = rng.choice(CLEAR_UNITS)
+            for piece_entry in unit:
+                engine.drop(piece_entry[0], int(piece_entry[1:]))
+            pieces -= len(unit)
+        else:
+            engine.drop(*rng.choice(MOVES))
+            pieces -= 1
+    return engine
+
+def random_boards(rng, count):
+    for board in range(1, count + 1):
+        # Mostly low boards; every fifth one tall enough to fold sealed rows
+        yield f"board {board}", build(rng, rng.randint(2600, 4000) if board % 5 == 0 else rng.randint(0, 400))
+
+def restore_boards():
+    # Boards from the sealed-restore lines, just before each drop that
+    # unfolds the archive
+    with open(SEALED_RESTORE) as f:
+        lines = f.read().splitlines()
+    for number, line in enumerate(lines, 1):
+        engine = TetrisEngine()
+        for piece, (shape_letter, column) in enumerate(parse_line(line)):
+            state = engine.snapshot()
+            base_row = engine.base_row
+            engine.drop(shape_letter, int(column))
+            if engine.base_row < base_row:
+                before = TetrisEngine()
+                before.restore(state)
+                yield f"{os.path.basename(SEALED_RESTORE)} line {number} piece {piece}", before
+
+def check_move(engine, shape_letter, left_col, outcome):
+    # Error text for outcome, or None when it matches a real drop
+    state = engine.snapshot()
+    height_before = engine.height()
+    heights_before = [engine.base_row + height for height in engine.column_heights]
+    height = engine.drop(shape_letter, left_col)
+    profile = tuple(engine.base_row + height for height in engine.column_heights)
+    engine.restore(state)
+    if height < 0:
+        if outcome != (-height, None, None, None, None):
+            return f"drop rejected it with status {-height}, evaluate gave {outcome}"
+        return None
+    if (outcome.status, outcome.height, outcome.profile) != (0, height, profile):
+        return f"drop gave height {height}, profile {profile}; evaluate gave {outcome}"
+    skirt, _, row_masks, _ = PLACEMENTS[shape_letter][left_col]
+    landing_row = max(heights_before[col] - bottom for col, bottom in skirt)
+    if outcome.landing_row != landing_row:
+        return f"landing row {landing_row}, evaluate gave {outcome.landing_row}"
+    cleared = height_before + max(landing_row + len(row_masks) - height_before, 0) - height
+    if len(outcome.cleared_rows) != cleared:
+        return f"drop cleared {cleared} rows, evaluate gave {outcome.cleared_rows}"
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Check TetrisEngine.evaluate against real drops.")
+    parser.add_argument('--boards', type=int, default=100, help="Random boards to evaluate from.")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures = boards = folded = 0
+    for name, engine in chain(random_boards(rng, args.boards), restore_boards()):
+        boards += 1
+        folded += bool(engine.base_row)
+        before = engine.snapshot()
+        candidates = list(MOVES) + REJECTED
+        outcomes = engine.evaluate(candidates)
+        if engine.snapshot() != before:
+            print(f"{name}: evaluate changed the board")
+            failures += 1
+            continue
+        for (shape_letter, left_col), outcome in zip(candidates, outcomes):
+            error = check_move(engine, shape_letter, left_col, outcome)
+            if error:
+                print(f"{name}, move {shape_letter}{left_col}: {error}")
+                failures += 1
+    print(f"{boards} boards ({folded} with folded rows), {failures} failing")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import os
+import random
+import sys
+
+# Define paths
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))  # Path to the 'tests/' directory
+ENGINE_DIR = os.path.abspath(os.path.join(TEST_DIR, os.pardir))  # Parent directory containing 'tetris.py'
+sys.path.insert(0, ENGINE_DIR)
+
+from tetris import MOVES, PREFIX_NODE_BYTES, PrefixCache, parse_line, simulate_bitboard, simulate_cached
+from test_generator import CLEAR_UNITS
+
+# Prefix-cache cap check. A long line and lines that extend or branch off
+# it are played through one PrefixCache with a small cap. Every result must
+# match an uncached bitboard game, the cache must be back under its cap after
+# every line, and its running size must equal a recount of the trie nodes
+# and snapshots still held.
+
+def random_pieces(rng, count):
+    # Valid moves with runs that clear rows, so the stack stays low
+    entries = []
+    while len(entries) < count:
+        if rng.random() < 0.2:
+            entries.extend(rng.choice(CLEAR_UNITS))
+        else:
+            shape_letter, left_col = rng.choice(MOVES)
+            entries.append(f"{shape_letter}{left_col}")
+    return entries[:count]
+
+def workload(rng, pieces, lines):
+    base = random_pieces(rng, pieces)
+    yield ','.join(base)
+    for _ in range(lines):
+        cut = rng.randint(0, len(base))
+        yield ','.join(base[:cut] + random_pieces(rng, rng.randint(1, pieces // 10)))
+
+def recount(cache):
+    # Bytes held by the trie, counted from scratch
+    size = sum(cache.snapshots.values())
+    stack = list(cache.root.children.values())
+    while stack:
+        node = stack.pop()
+        size += PREFIX_NODE_BYTES + len(node.key)
+        stack.extend(node.children.values())
+    return size
+
+def check(cap, pieces, lines, seed):
+    rng = random.Random(seed)
+    cache = PrefixCache(max_bytes=cap)
+    peak = 0
+    for number, line in enumerate(workload(rng, pieces, lines), 1):
+        got = simulate_cached(line, cache)
+        expected = simulate_bitboard(parse_line(line))
+        if got != expected:
+            return f"line {number}: cached {got}, expected {expected}"
+        if cache.size > cap:
+            return f"line {number}: cache holds {cache.size} bytes, cap {cap}"
+        if cache.size != recount(cache):
+            return f"line {number}: cache counts {cache.size} bytes, recount {recount(cache)}"
+        peak = max(peak, cache.size)
+    print(f"cap {cap}: ok, peak {peak} bytes, {len(cache.snapshots)} snapshots left")
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the prefix cache stays under its cap.")
+    parser.add_argument('--pieces', type=int, default=50000, help="Pieces in the long line.")
+    parser.add_argument('--lines', type=int, default=20, help="Lines extending or branching off it.")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    # Too small for one long line's nodes, room for a few, and roomy
+    failures = 0
+    for cap in (1 << 16, 1 << 20, 16 << 20):
+        error = check(cap, args.pieces, args.lines, args.seed)
+        if error:
+            print(f"cap {cap}: {error}")
+            failures += 1
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+import argparse
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+
+# Define paths
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))  # Path to the 'tests/' directory
+ENGINE_DIR = os.path.abspath(os.path.join(TEST_DIR, os.pardir))  # Parent directory containing 'tetris.py'
+sys.path.insert(0, ENGINE_DIR)
+
+from tetris import simulate
+from tetris_client import connect
+from tetris_verify import random_game
+
+# Request check for --serve. A server is started on a free localhost port
+# and fed seeded random games, with row-clearing runs and the odd bad
+# token, both as plain lines and as sessions: each game is split into
+# :append chunks, and every reply must be the height of the pieces sent so
+# far, -1 from the first rejected piece on. :height must repeat the last
+# reply, :reset must empty the board and :close must forget the session.
+# Two sessions are interleaved on one connection, and one line and one
+# append are long enough to run in the worker pool.
+
+HEAVY_UNIT = [('Q', '0'), ('Q', '2'), ('Q', '4'), ('Q', '6'), ('L', '8')]  # Clears two rows
+HEAVY_PIECES = HEAVY_UNIT * 5000  # Over 64 KB as text
+
+def format_line(pieces):
+    return ','.join(f"{shape_letter}{column}" for shape_letter, column in pieces)
+
+def expected_height(pieces):
+    try:
+        return simulate(pieces)
+    except Exception:
+        return -1
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(address, jobs):
+    server = subprocess.Popen([sys.executable, os.path.join(ENGINE_DIR, 'tetris.py'), '--serve', address, '--jobs', str(jobs)],
+                              stdin=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    banner = server.stderr.readline()
+    if not banner.startswith('Serving on'):
+        server.kill()
+        server.wait()
+        sys.exit(f"server did not start: {banner.strip() or 'no output'}")
+    return server
+
+class Client:
+    def __init__(self, address):
+        self.sock = connect(address)
+        self.stream = self.sock.makefile('rwb')
+        self.failures = 0
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+    def request(self, line):
+        self.stream.write(line.encode() + b'\n')
+        self.stream.flush()
+        return self.stream.readline().decode().rstrip('\n')
+
+    def expect(self, line, expected, what):
+        reply = self.request(line)
+        if reply != str(expected):
+            print(f"{what}: {line[:40]!r} got {reply!r}, expected {expected!r}")
+            self.failures += 1
+        return reply
+
+def chunks(rng, pieces):
+    # pieces cut into a few random :append chunks, the first one possibly empty
+    cuts = sorted(rng.sample(range(len(pieces) + 1), min(3, len(pieces) + 1)))
+    bounds = [0] + cuts + [len(pieces)]
+    return [pieces[start:end] for start, end in zip(bounds, bounds[1:])]
+
+def check_session(client, rng, games):
+    # Plays games one after another on one session, :reset in between,
+    # interleaved with a second session that stays empty
+    session = client.request(':new')
+    other = client.request(':new')
+    if not session.isdigit() or not other.isdigit() or session == other:
+        print(f":new gave ids {session!r} and {other!r}")
+        client.failures += 1
+        return
+    for number, pieces in enumerate(games):
+        what = f"session {session} game {number}"
+        sent = []
+        height = 0
+        for chunk in chunks(rng, pieces):
+            sent += chunk
+            height = expected_height(sent)
+            client.expect(f":append {session} {format_line(chunk)}", height, what)
+            client.expect(f":height {other}", 0, f"session {other}")
+        client.expect(f":height {session}", height, what)
+        client.expect(f":reset {session}", 0, what)
+        client.expect(f":height {session}", 0, what)
+    client.expect(f":close {session}", 'ok', f"session {session}")
+    client.expect(f":height {session}", 'error: unknown session', f"closed session {session}")
+    client.expect(f":close {other}", 'ok', f"session {other}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the --serve requests against the engine.")
+    parser.add_argument('--games', type=int, default=100, help="Random games to play.")
+    parser.add_argument('--max-pieces', type=int, default=500, help="Longest random game.")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    games = [random_game(rng, args.max_pieces) for _ in range(args.games)]
+
+    address = f"127.0.0.1:{free_port()}"
+    server = start_server(address, jobs=2)
+    try:
+        client = Client(address)
+        try:
+            for number, pieces in enumerate(games + [HEAVY_PIECES]):
+                client.expect(format_line(pieces), expected_height(pieces), f"line {number}")
+            check_session(client, rng, games[:args.games // 2] + [HEAVY_PIECES])
+            check_session(client, rng, games[args.games // 2:])
+            session = client.request(':new')
+            for repeat in range(1, 3):
+                client.expect(f":append {session} {format_line(HEAVY_PIECES)}", expected_height(HEAVY_PIECES * repeat), "heavy append")
+            client.expect(f":close {session}", 'ok', "heavy append")
+            client.expect(':frob', 'error: unknown command frob', "unknown command")
+        finally:
+            client.close()
+    finally:
+        # SIGINT lets run_server shut its worker pool down
+        server.send_signal(signal.SIGINT)
+        server.wait()
+    print(f"{len(games) + 1} games, {client.failures} failing")
+    sys.exit(1 if client.failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Define paths
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))  # Path to the 'tests/' directory
+ENGINE_DIR = os.path.abspath(os.path.join(TEST_DIR, os.pardir))  # Parent directory containing 'tetris.py'
+BASELINE_FILE = os.path.join(TEST_DIR, 'startup_baseline.json')
+
+# Cold-start benchmark. Pipelines run tetris.py as a fresh process per small
+# job, so the time from exec to exit on a one-line input is measured as a
+# metric of its own, next to a bare interpreter start. Runs of the commands
+# are interleaved so drift on the machine hits all of them alike. Bytecode
+# caching is forced on and every command runs once untimed first, so the
+# numbers are for warm caches, as on a pipeline's second and later jobs.
+# `python -X importtime -c "import tetris_core"` then breaks down where the
+# engine's import time goes, module by module.
+
+COMMANDS = {
+    'python': ['-c', 'pass'],                    # Interpreter startup alone
+    'module': ['-m', 'tetris'],                  # Fast start, launcher run as a module
+    'script': ['tetris.py'],                     # Fast start, launcher run as a script
+    'flags': ['tetris.py', '--engine', 'dict'],  # Full argument parsing
+}
+ONE_LINE = b'Q0,Q2,Q4,Q6,I0,I4,Q8\n'
+EXPECTED = b'1\n'
+
+def child_env():
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return env
+
+def run_once(command, env):
+    # Wall time of one run in milliseconds
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable] + command, input=ONE_LINE, capture_output=True, cwd=ENGINE_DIR, env=env)
+    elapsed = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0 or (command != COMMANDS['python'] and proc.stdout != EXPECTED):
+        raise RuntimeError(f"{' '.join(command)} failed: {proc.stderr.decode(errors='replace')}{proc.stdout!r}")
+    return elapsed
+
+def wall_times(runs):
+    env = child_env()
+    samples = {name: [] for name in COMMANDS}
+    for name, command in COMMANDS.items():
+        run_once(command, env)
+    for _ in range(runs):
+        for name, command in COMMANDS.items():
+            samples[name].append(run_once(command, env))
+    summary = {}
+    for name, times in samples.items():
+        times.sort()
+        summary[name] = {
+            'min': times[0],
+            'median': times[len(times) // 2],
+            'p90': times[min(int(len(times) * 0.9), len(times) - 1)],
+        }
+    return summary
+
+def import_times(runs):
+    # Fastest cumulative import time in microseconds of tetris_core and of
+    # each module it imports directly
+    env = child_env()
+    best = {}
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import tetris_core'],
+                              capture_output=True, text=True, cwd=ENGINE_DIR, env=env, check=True)
+        # Lines read "import time: self | cumulative | name", with two spaces
+        # of indent per level and children listed before their parent
+        children = {}
+        for line in proc.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) != 3 or not fields[1].strip().isdigit():
+                continue
+            cumulative = int(fields[1])
+            name = fields[2][1:]
+            depth = len(name) - len(name.lstrip())
+            if depth == 2:
+                children[name.strip()] = cumulative
+            elif depth == 0:
+                if name == 'tetris_core':
+                    children['tetris_core'] = cumulative
+                    for module, micros in children.items():
+                        best[module] = min(best.get(module, micros), micros)
+                children = {}
+    return best
+
+def compare(results, baseline, tolerance_ms):
+    # Startup cost over a bare interpreter, so the machine's speed cancels out
+    regressions = []
+    python = results['wall_ms']['python']['median']
+    expected_python = baseline['wall_ms']['python']['median']
+    for name, times in results['wall_ms'].items():
+        if name == 'python' or name not in baseline['wall_ms']:
+            continue
+        overhead = times['median'] - python
+        expected = baseline['wall_ms'][name]['median'] - expected_python
+        status = 'REGRESSION' if overhead - expected > tolerance_ms else 'ok'
+        print(f"{name:>8}: +{overhead:6.1f} ms over python (baseline +{expected:6.1f} ms) {status}")
+        if status != 'ok':
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for tetris.py on a one-line input.")
+    parser.add_argument('--runs', type=int, default=20, help="Timed runs of every command")
+    parser.add_argument('--import-runs', type=int, default=5, help="Runs of python -X importtime; the fastest time per module is kept")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    parser.add_argument('--save-baseline', nargs='?', const=BASELINE_FILE, metavar='PATH', help="Save the results as the baseline (default %(const)s)")
+    parser.add_argument('--compare', nargs='?', const=BASELINE_FILE, metavar='PATH', help="Compare startup times against a saved baseline (default %(const)s)")
+    parser.add_argument('--tolerance', type=float, default=5.0, metavar='MS', help="Allowed growth of a command's median over the bare interpreter before it counts as a regression")
+    args = parser.parse_args()
+
+    results = {'python': sys.version.split()[0], 'wall_ms': wall_times(args.runs), 'import_us': import_times(args.import_runs)}
+    for name, times in results['wall_ms'].items():
+        print(f"{name:>8}: {times['median']:6.1f} ms median {times['min']:6.1f} ms min {times['p90']:6.1f} ms p90  ({' '.join(COMMANDS[name])})")
+    for name, micros in sorted(results['import_us'].items(), key=lambda item: -item[1]):
+        print(f"{name:>16}: {micros / 1000:6.2f} ms import")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
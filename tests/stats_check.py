@@ -0,0 +1,92 @@
+import argparse
+import os
+import random
+import sys
+
+# Define paths
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))  # Path to the 'tests/' directory
+ENGINE_DIR = os.path.abspath(os.path.join(TEST_DIR, os.pardir))  # Parent directory containing 'tetris.py'
+sys.path.insert(0, ENGINE_DIR)
+
+import tetris_stats
+from tetris import simulate
+from tetris_verify import random_game
+
+# Sync check for the instrumented engines behind --stats. They wrap the
+# drop phase helpers of tetris_core.py and copy its simulate loops, so
+# seeded random games (long enough to compact, with row-clearing runs and
+# the odd bad token), the sealed-restore test lines and a tower over an
+# empty well, where compaction has nothing to fold, are played through both,
+# and the heights must match. The dict and bitboard engines must also report
+# the same counters, and compactions must equal the folds that actually
+# moved rows.
+
+COUNTERS = ('lines', 'pieces', 'rejected', 'clears', 'rows_cleared', 'compactions', 'restores', 'peak_height', 'peak_live_cells')
+SEALED_RESTORE = os.path.join(TEST_DIR, 'test_sealed_restore.txt')
+TALL_WELL = ','.join(['Q0,Q2,Q4,Q6'] * 600)  # 1200 rows, columns 8 and 9 empty
+
+folds = 0
+
+def counting(compact):
+    # Wraps a compaction function to count the calls that folded rows
+    def wrapper(*args):
+        global folds
+        folded = compact(*args)
+        if folded:
+            folds += 1
+        return folded
+    return wrapper
+
+tetris_stats.compact_sealed_rows = counting(tetris_stats.compact_sealed_rows)
+tetris_stats.bitboard_compact_sealed_rows = counting(tetris_stats.bitboard_compact_sealed_rows)
+
+def format_line(pieces):
+    return ','.join(f"{shape_letter}{column}" for shape_letter, column in pieces)
+
+def check_line(line):
+    # Error text for line, or None when both engines agree with their copies
+    global folds
+    counters = {}
+    for engine in ('dict', 'bitboard'):
+        try:
+            expected = simulate(tetris_stats.parse_line(line), engine=engine)
+        except Exception:
+            expected = -1
+        stats = tetris_stats.Stats()
+        folds = 0
+        try:
+            got = tetris_stats.simulate_line(line, stats, engine=engine)
+        except Exception:
+            got = -1
+        if got != expected:
+            return f"{engine}: stats height {got}, engine height {expected}"
+        if stats.compactions != folds:
+            return f"{engine}: {stats.compactions} compactions counted, {folds} folds"
+        counters[engine] = {name: getattr(stats, name) for name in COUNTERS}
+    if counters['dict'] != counters['bitboard']:
+        return f"counters differ: dict {counters['dict']}, bitboard {counters['bitboard']}"
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the --stats engines agree with tetris_core.py.")
+    parser.add_argument('--games', type=int, default=200, help="Random games to play.")
+    parser.add_argument('--max-pieces', type=int, default=5000, help="Longest random game.")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with open(SEALED_RESTORE) as f:
+        lines = f.read().splitlines() + [TALL_WELL]
+    lines += [format_line(random_game(rng, args.max_pieces)) for _ in range(args.games)]
+
+    failures = 0
+    for number, line in enumerate(lines, 1):
+        error = check_line(line)
+        if error:
+            print(f"line {number}: {error}")
+            failures += 1
+    print(f"{len(lines)} lines, {failures} failing")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -106,24 +106,23 @@ def adjust_grid(grid, cleared_rows):
 
     return new_grid
 
-def process_line(line):
+def simulate(pieces):
+    # Final height for (shape_letter, column) tokens, or -1 if a piece is
+    # rejected. This is the entry point of the "benchmark" engine in the
+    # registry of tetris.py.
     grid = {}  # row number -> set of occupied columns
-    pieces = line.strip().split(',')
 
-    for piece_entry in pieces:
-        if not piece_entry:
-            continue
-        shape_letter = piece_entry[0]
-        left_col = int(piece_entry[1])
-        shape_positions = SHAPES[shape_letter]
+    for shape_letter, left_col in pieces:
+        shape_positions = SHAPES.get(shape_letter)
+        if shape_positions is None:
+            return -1
 
         # Drop the piece into the grid
         try:
-            final_positions = drop_piece(grid, shape_positions, left_col)
+            final_positions = drop_piece(grid, shape_positions, int(left_col))
         except ValueError:
-            # Piece goes outside the grid; print -1 and return
-            print('-1')
-            return
+            # Piece goes outside the grid
+            return -1
 
         # Check for full rows
         rows_to_check = set([row for (row, _) in final_positions])
@@ -141,7 +140,12 @@ def process_line(line):
         height = 0
     else:
         height = max(grid.keys()) + 1
-    print(height)
+    return height
+
+def process_line(line):
+    pieces = line.strip().split(',')
+    # Only the first digit after the shape letter is read as the column
+    print(simulate((piece_entry[0], piece_entry[1]) for piece_entry in pieces if piece_entry))
 
 def main():
     lines = sys.stdin.read().splitlines()
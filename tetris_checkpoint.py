@@ -0,0 +1,183 @@
+import os
+import re
+import mmap
+import struct
+from array import array
+from itertools import islice
+from time import monotonic
+
+from tetris_core import TetrisEngine
+
+# Checkpoints for long games (--checkpoint/--resume). A checkpoint records
+# the input position (line index and pieces already dropped from that line)
+# and the TetrisEngine state in one binary file:
+#
+#   header     HEADER: magic, version, line, piece, base_row, row count,
+#              the 10 column heights and the number of sealed chunks
+#   lengths    uint64 byte length of every sealed chunk
+#   sealed     the engine's zlib-compressed sealed rows, as stored
+#   rows       live rows packed 10 bits each (four rows to five bytes),
+#              then zero-run compressed: segments of (literal length, zero
+#              run length) as two uint32 followed by the literal bytes
+#
+# Files are written to a temporary name, synced and renamed into place, so
+# a crash leaves either the old or the new checkpoint. Loading maps the file
+# and keeps the sealed chunks as views into the map instead of copying them.
+
+CHECKPOINT_MAGIC = b'TTCK'
+CHECKPOINT_VERSION = 1
+HEADER = struct.Struct('<4sHxxQQqQ10QQ')
+SEGMENT = struct.Struct('<II')
+ZERO_RUN = re.compile(b'\x00{8,}')  # Shorter runs cost less as literals
+
+CHECKPOINT_PIECES = 1 << 20
+CHECKPOINT_SECONDS = 60.0
+CHECKPOINT_CHUNK = 1 << 12  # Pieces dropped between checks of the clock
+RESULT_SECONDS = 0.5        # Finished lines' results are held back at most this long
+RESULT_LINES = 1 << 16      # ... and for at most this many lines
+
+def pack_rows(rows):
+    padded = rows + array('H', bytes(2 * (-len(rows) % 4)))
+    packed = bytearray(len(padded) // 4 * 5)
+    for i in range(0, len(padded), 4):
+        value = padded[i] | padded[i + 1] << 10 | padded[i + 2] << 20 | padded[i + 3] << 30
+        j = i // 4 * 5
+        packed[j:j + 5] = value.to_bytes(5, 'little')
+    return packed
+
+def unpack_rows(packed, count):
+    rows = array('H', bytes(2 * (count + 3)))
+    for j in range(0, len(packed), 5):
+        value = int.from_bytes(packed[j:j + 5], 'little')
+        i = j // 5 * 4
+        rows[i] = value & 0x3FF
+        rows[i + 1] = value >> 10 & 0x3FF
+        rows[i + 2] = value >> 20 & 0x3FF
+        rows[i + 3] = value >> 30
+    del rows[count:]
+    return rows
+
+def encode_zero_runs(data):
+    encoded = bytearray()
+    pos = 0
+    for match in ZERO_RUN.finditer(data):
+        encoded += SEGMENT.pack(match.start() - pos, match.end() - match.start())
+        encoded += data[pos:match.start()]
+        pos = match.end()
+    encoded += SEGMENT.pack(len(data) - pos, 0)
+    encoded += data[pos:]
+    return encoded
+
+def decode_zero_runs(view):
+    data = bytearray()
+    pos = 0
+    while pos < len(view):
+        literal, zeros = SEGMENT.unpack_from(view, pos)
+        pos += SEGMENT.size
+        data += view[pos:pos + literal]
+        data += bytes(zeros)
+        pos += literal
+    return data
+
+def save_checkpoint(path, engine, line_index, piece_index):
+    header = HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, line_index, piece_index,
+                         engine.base_row, len(engine.rows), *engine.column_heights, len(engine.sealed))
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(header)
+        f.write(array('Q', [len(chunk) for chunk in engine.sealed]))
+        for chunk in engine.sealed:
+            f.write(chunk)
+        f.write(encode_zero_runs(pack_rows(engine.rows)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+def load_checkpoint(path, engine):
+    # Restores engine from path; returns (line index, piece index)
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, line_index, piece_index, base_row, row_count, *fields = HEADER.unpack_from(data)
+    if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} checkpoint")
+    column_heights, sealed_count = fields[:10], fields[10]
+    view = memoryview(data)
+    pos = HEADER.size
+    lengths = view[pos:pos + 8 * sealed_count].cast('Q')
+    pos += 8 * sealed_count
+    sealed = []
+    for length in lengths:
+        sealed.append(view[pos:pos + length])
+        pos += length
+    rows = unpack_rows(decode_zero_runs(view[pos:]), row_count)
+    engine.restore((rows, column_heights, base_row, sealed))
+    return line_index, piece_index
+
+def release(held, sink):
+    # Write and flush the held results; a checkpoint past them follows
+    for height in held:
+        sink.write(height)
+    held.clear()
+    sink.flush()
+
+def run_games(open_games, sink, path, resume=False, every_pieces=CHECKPOINT_PIECES, every_seconds=CHECKPOINT_SECONDS):
+    # open_games(start_line) yields token iterators for the lines from
+    # start_line on. Results are held back here rather than left to the
+    # sink, which flushes on its own schedule: they reach the sink, and are
+    # flushed, only right before a checkpoint saved past their lines, and at
+    # least every RESULT_SECONDS. A resumed run therefore only repeats results
+    # flushed just before a crash that cut the checkpoint after them short.
+    engine = TetrisEngine()
+    start_line = piece_index = 0
+    if resume and os.path.exists(path):
+        start_line, piece_index = load_checkpoint(path, engine)
+    next_line = start_line
+    held = []
+    pieces_left = every_pieces
+    deadline = monotonic() + every_seconds
+    release_at = monotonic() + RESULT_SECONDS
+
+    for line_index, pieces in enumerate(open_games(start_line), start_line):
+        if piece_index:
+            # Resuming inside this line: its first pieces are on the board
+            for _ in islice(pieces, piece_index):
+                pass
+        else:
+            engine.reset()
+        height = engine.height()
+        while True:
+            chunk = list(islice(pieces, min(pieces_left, CHECKPOINT_CHUNK)))
+            if not chunk:
+                break
+            try:
+                height = engine.run(chunk)
+            except ValueError:
+                height = -1
+            if height < 0:
+                break
+            piece_index += len(chunk)
+            pieces_left -= len(chunk)
+            if not pieces_left or monotonic() >= deadline:
+                release(held, sink)
+                save_checkpoint(path, engine, line_index, piece_index)
+                pieces_left = every_pieces
+                deadline = monotonic() + every_seconds
+                release_at = monotonic() + RESULT_SECONDS
+        held.append(height)
+        # Skip whatever is left of the line after an error
+        for _ in pieces:
+            pass
+        piece_index = 0
+        next_line = line_index + 1
+        now = monotonic()
+        if now >= deadline or now >= release_at or len(held) >= RESULT_LINES:
+            release(held, sink)
+            engine.reset()
+            save_checkpoint(path, engine, next_line, 0)
+            pieces_left = every_pieces
+            deadline = monotonic() + every_seconds
+            release_at = monotonic() + RESULT_SECONDS
+
+    release(held, sink)
+    engine.reset()
+    save_checkpoint(path, engine, next_line, 0)
@@ -0,0 +1,33 @@
+import sys
+import socket
+import argparse
+
+# Minimal client for `tetris.py --serve`: sends each stdin line (a piece
+# sequence or a :command) and prints the server's reply.
+
+def connect(address):
+    # address is HOST:PORT, :PORT (localhost) or unix:PATH
+    if address.startswith('unix:'):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address[len('unix:'):])
+        return sock
+    host, _, port = address.rpartition(':')
+    return socket.create_connection((host or '127.0.0.1', int(port)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Send piece sequences to a running Tetris server")
+    parser.add_argument('address', help="HOST:PORT, :PORT or unix:PATH")
+    args = parser.parse_args()
+
+    with connect(args.address) as sock, sock.makefile('rwb') as stream:
+        for line in sys.stdin.buffer:
+            stream.write(line.rstrip(b'\r\n') + b'\n')
+            stream.flush()
+            reply = stream.readline()
+            if not reply:
+                break
+            sys.stdout.buffer.write(reply)
+    sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1936 @@
+import sys
+import os
+from array import array
+import zlib
+from itertools import chain, repeat, islice, accumulate
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from time import monotonic
+
+# The engine behind tetris.py, which only imports this module and calls
+# main, so the bulk of the code is loaded from cached bytecode on every
+# start. Only what the default stdin loop needs is imported here; argparse,
+# multiprocessing, mmap and the optional modules are imported where they are
+# used, so a short run does not pay for them at startup.
+
+# Define the shapes as lists of (row, column) positions
+SHAPES = {
+    'Q': [(0, 0), (0, 1), (1, 0), (1, 1)],  # Square
+    'Z': [(1, 0), (1, 1), (0, 1), (0, 2)],  # Z-shape
+    'S': [(1, 1), (1, 2), (0, 0), (0, 1)],  # S-shape
+    'T': [(1, 0), (1, 1), (1, 2), (0, 1)],  # T-shape
+    'I': [(0, 0), (0, 1), (0, 2), (0, 3)],  # Line (horizontal)
+    'L': [(0, 0), (1, 0), (2, 0), (0, 1)],  # L-shape
+    'J': [(0, 1), (1, 1), (2, 1), (0, 0)]   # J-shape
+}
+
+def print_shape(shape_letter):
+    shape_positions = SHAPES.get(shape_letter)
+    if not shape_positions:
+        print(f"Shape '{shape_letter}' is not defined.")
+        return
+    # Find the dimensions of the shape
+    max_row = max(pos[0] for pos in shape_positions)
+    max_col = max(pos[1] for pos in shape_positions)
+    # Create a grid for the shape
+    grid = [['.' for _ in range(max_col + 1)] for _ in range(max_row + 1)]
+    for row_offset, col_offset in shape_positions:
+        grid[row_offset][col_offset] = shape_letter
+    # Print the grid
+    print(f"Shape '{shape_letter}':")
+    for row in reversed(grid):  # reverse to print from top to bottom
+        print(''.join(row))
+    print()
+
+# Placement tables, precomputed at import time. PLACEMENTS[shape][left_col]
+# only has entries for placements that stay inside the grid, so one lookup
+# both validates a move and yields everything drop_piece needs:
+#   skirt     - (col, lowest row offset) per touched column
+#   tops      - (col, highest row offset) per touched column; the column's
+#               new height is landing_row + top + 1
+#   row_masks - bitmask of the piece's cells in each row, bottom first
+#   row_cols  - touched columns in each row, bottom first
+def build_placements(width=10):
+    placements = {}
+    for shape_letter, shape_positions in SHAPES.items():
+        by_col = {}
+        for left_col in range(width):
+            cols = [col_offset + left_col for _, col_offset in shape_positions]
+            if max(cols) >= width:
+                continue
+            piece_rows = max(row_offset for row_offset, _ in shape_positions) + 1
+            row_masks = [0] * piece_rows
+            row_cols = [[] for _ in range(piece_rows)]
+            skirt = {}
+            tops = {}
+            for row_offset, col_offset in sorted(shape_positions):
+                col = col_offset + left_col
+                row_masks[row_offset] |= 1 << col
+                row_cols[row_offset].append(col)
+                skirt[col] = min(skirt.get(col, row_offset), row_offset)
+                tops[col] = max(tops.get(col, row_offset), row_offset)
+            by_col[left_col] = (tuple(skirt.items()), tuple(tops.items()), tuple(row_masks), tuple(tuple(cols) for cols in row_cols))
+        placements[shape_letter] = by_col
+    return placements
+
+# The standard board's tables are loaded from tetris_tables.py, a generated
+# module whose bytecode Python caches, instead of being rebuilt on every
+# start. The module is written by --write-tables and ignored when it was
+# generated from different SHAPES or for another TABLES_LAYOUT; bump the
+# layout whenever build_placements or mask_text change what they produce.
+TABLES_MODULE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tetris_tables.py')
+TABLES_LAYOUT = 1
+
+try:
+    import tetris_tables
+    if tetris_tables.SHAPES != SHAPES or getattr(tetris_tables, 'LAYOUT', None) != TABLES_LAYOUT:
+        tetris_tables = None
+except ImportError:
+    tetris_tables = None
+
+PLACEMENTS = tetris_tables.PLACEMENTS if tetris_tables else build_placements()
+WIDE_PLACEMENTS = {10: PLACEMENTS}
+
+def placements_for(width):
+    # Placement tables for other board widths, built on first use
+    placements = WIDE_PLACEMENTS.get(width)
+    if placements is None:
+        placements = WIDE_PLACEMENTS[width] = build_placements(width)
+    return placements
+
+# Status codes returned by drop_piece and bitboard_drop_piece
+PLACED = 0
+OUT_OF_BOUNDS = 1
+COLLISION = 2
+UNKNOWN_SHAPE = 3
+STATUS_MESSAGES = {
+    OUT_OF_BOUNDS: "Piece goes outside the grid horizontally",
+    COLLISION: "Collision detected when placing the piece",
+    UNKNOWN_SHAPE: "Unknown shape",
+}
+
+class RowIndex:
+    # Maps logical rows (what drop_piece sees) to physical row ids (the keys of
+    # column_blocks and row_counts). Rows are only ever created on top of the
+    # stack, so physical ids increase with logical order and a cleared row is
+    # simply marked dead: nothing above it is renumbered. A Fenwick tree over
+    # the live flags answers both directions in O(log H). Until a row dies the
+    # mapping is the identity, so the tree is only built at the first removal.
+    def __init__(self):
+        self.rebuild(0)
+
+    def _add(self, physical_row, delta):
+        i = physical_row + 1
+        tree = self.tree
+        while i <= self.capacity:
+            tree[i] += delta
+            i += i & -i
+
+    def _grow(self):
+        # Double the capacity and rebuild the tree from the live flags
+        self.capacity *= 2
+        self.live.extend(bytes(len(self.live)))
+        if self.size != self.count:
+            self._build_tree()
+
+    def _build_tree(self):
+        # Linear-time Fenwick construction from the live flags
+        tree = [0] * (self.capacity + 1)
+        for i in range(1, self.capacity + 1):
+            tree[i] += self.live[i - 1]
+            parent = i + (i & -i)
+            if parent <= self.capacity:
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def rebuild(self, count):
+        # Reset to physical rows 0..count-1, all live (used after renumbering)
+        self.capacity = 8
+        while self.capacity < count:
+            self.capacity *= 2
+        self.live = bytearray(b'\x01' * count) + bytearray(self.capacity - count)
+        self.tree = None
+        self.size = count   # physical ids handed out so far
+        self.count = count  # live rows, i.e. the number of logical rows
+
+    def append(self):
+        # Create a new logical row on top of the stack
+        if self.size == self.capacity:
+            self._grow()
+        physical_row = self.size
+        if physical_row != self.count:
+            self._add(physical_row, 1)
+        self.size += 1
+        self.live[physical_row] = 1
+        self.count += 1
+        return physical_row
+
+    def remove(self, physical_row):
+        if self.size == self.count:
+            # First removal: rows 0..size-1 are all live, and tree[i] counts
+            # the live rows among the lowbit(i) ids ending at i
+            size = self.size
+            self.tree = [0] + [i & -i for i in range(1, size + 1)] + [max(size - i + (i & -i), 0) for i in range(size + 1, self.capacity + 1)]
+        self.live[physical_row] = 0
+        self._add(physical_row, -1)
+        self.count -= 1
+
+    def physical(self, row):
+        if self.size == self.count:
+            return row  # Nothing cleared since the last rebuild
+        # Fenwick descent: find the (row + 1)-th live physical row
+        pos = 0
+        remaining = row + 1
+        step = self.capacity
+        tree = self.tree
+        while step:
+            nxt = pos + step
+            if nxt <= self.capacity and tree[nxt] < remaining:
+                pos = nxt
+                remaining -= tree[nxt]
+            step >>= 1
+        return pos
+
+    def logical(self, physical_row):
+        # Number of live rows strictly below physical_row
+        if self.size == self.count:
+            return physical_row
+        total = 0
+        i = physical_row
+        tree = self.tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def physical_rows(self):
+        # Live physical rows in logical order
+        return [row for row in range(self.size) if self.live[row]]
+
+# Rendering for --visualize. A GridView decides which pieces get frames
+# (every every-th one) and how much of the stack they show (the top rows,
+# or all of it when rows is None). Each frame is built as a list of lines
+# and written at once. With ansi the terminal is treated as a fixed screen:
+# lines are addressed by position and only the ones that differ from the
+# previous frame are rewritten.
+
+class GridView:
+    __slots__ = ('rows', 'every', 'ansi', 'pieces', 'screen')
+
+    def __init__(self, rows=None, every=1, ansi=False):
+        self.rows = rows
+        self.every = every
+        self.ansi = ansi
+        self.pieces = 0
+        self.screen = None  # Lines currently on the terminal (ansi only)
+
+    def due(self):
+        # Called once per placed piece; whether this one gets frames
+        self.pieces += 1
+        return self.pieces % self.every == 0
+
+    def window(self, height):
+        # Lowest row shown for a stack of this height
+        return 0 if self.rows is None else max(height - self.rows, 0)
+
+    def show(self, title, lines):
+        lines.insert(0, title)
+        if not self.ansi:
+            sys.stdout.write('\n'.join(lines) + '\n')
+            return
+        screen = self.screen
+        out = []
+        if screen is None:
+            out.append('\x1b[H\x1b[2J')
+            screen = []
+        for number, line in enumerate(lines):
+            if number >= len(screen) or screen[number] != line:
+                out.append(f'\x1b[{number + 1};1H\x1b[2K{line}')
+        for number in range(len(lines), len(screen)):
+            out.append(f'\x1b[{number + 1};1H\x1b[2K')
+        # Park the cursor under the frame, where results and errors go
+        out.append(f'\x1b[{len(lines) + 1};1H')
+        sys.stdout.write(''.join(out))
+        sys.stdout.flush()
+        self.screen = lines
+
+def grid_view(visualize):
+    # visualize is a GridView, or True for full frames after every piece
+    return GridView() if visualize is True else visualize
+
+def grid_footer(low, width=10):
+    return "-" * (width + 4) if not low else f"    ({low} rows below)"
+
+MASK_DIGITS = str.maketrans('01', '.#')
+
+def mask_text(mask, width):
+    # Column 0 first
+    return format(mask, f'0{width}b')[::-1].translate(MASK_DIGITS)
+
+# Row text of every 10-bit mask, for the bitboard and run-length frames
+MASK_TEXT = tetris_tables.MASK_TEXT if tetris_tables else [mask_text(mask, 10) for mask in range(1 << 10)]
+
+def write_tables(path=TABLES_MODULE):
+    # Regenerate tetris_tables.py from SHAPES
+    lines = ["# Generated by `python tetris.py --write-tables` from tetris_core.SHAPES; do not edit.",
+             "# tetris_core.py loads these tables instead of building them at startup.", "",
+             f"LAYOUT = {TABLES_LAYOUT}", "",
+             "SHAPES = {"]
+    lines += [f"    {shape_letter!r}: {shape_positions!r}," for shape_letter, shape_positions in SHAPES.items()]
+    lines += ["}", "", "PLACEMENTS = {"]
+    for shape_letter, by_col in build_placements().items():
+        lines.append(f"    {shape_letter!r}: {{")
+        lines += [f"        {left_col!r}: {placement!r}," for left_col, placement in by_col.items()]
+        lines.append("    },")
+    lines += ["}", "", "MASK_TEXT = ["]
+    lines += [f"    {', '.join(repr(mask_text(mask, 10)) for mask in range(low, low + 8))}," for low in range(0, 1 << 10, 8)]
+    lines += ["]", ""]
+    with open(path + '.tmp', 'w') as f:
+        f.write('\n'.join(lines))
+    os.replace(path + '.tmp', path)
+
+def mask_lines(masks, low, width=10):
+    # Frame lines for rows low, low+1, ... holding masks (bottom up)
+    if not masks and not low:
+        return ["(Grid is empty)"]
+    rows = range(low + len(masks) - 1, low - 1, -1)
+    if width == 10:
+        lines = [f"{row:2}: {MASK_TEXT[mask]}" for row, mask in zip(rows, reversed(masks))]
+    else:
+        lines = [f"{row:2}: {mask_text(mask, width)}" for row, mask in zip(rows, reversed(masks))]
+    lines.append(grid_footer(low, width))
+    return lines
+
+# Both drops are built from phase helpers (landing, collision, placement,
+# full-row check, clear; the bitboard drop finds full rows while placing)
+# that the instrumented engines behind --stats call too, so tetris_stats.py
+# only adds counters and timers around them.
+
+def placement_status(shape_letter):
+    # Why PLACEMENTS has no placement for a move
+    return UNKNOWN_SHAPE if shape_letter not in PLACEMENTS else OUT_OF_BOUNDS
+
+def drop_piece(column_blocks, column_heights, shape_letter, left_col, row_counts, row_index, column_rows, visualize=False):
+    # Returns PLACED, or the status code explaining why the piece was rejected
+    placement = PLACEMENTS.get(shape_letter, {}).get(left_col)
+    if placement is None:
+        return placement_status(shape_letter)
+    skirt, tops, _, row_cols = placement
+    rows, physical_rows = landing_rows(column_heights, row_index, skirt, row_cols)
+    if collides(column_blocks, physical_rows, row_cols):
+        return COLLISION
+    place_piece(column_blocks, column_heights, row_counts, column_rows, shape_letter, rows, physical_rows, row_cols, tops)
+    draw = visualize and visualize.due()
+    if draw:
+        visualize.show("After dropping piece:", grid_lines(column_blocks, row_index, visualize.window(row_index.count)))
+    # Check for full rows
+    full_rows = check_full_rows(row_counts, rows, physical_rows)
+    if full_rows:
+        clear_rows(column_blocks, column_heights, row_counts, row_index, column_rows, full_rows)
+        if draw:
+            visualize.show(f"After clearing rows: {sorted(full_rows)}", grid_lines(column_blocks, row_index, visualize.window(row_index.count)))
+    return PLACED
+
+def landing_rows(column_heights, row_index, skirt, row_cols):
+    # The logical rows a piece comes to rest in, and their physical rows.
+    # The piece rests on the highest column under its bottom skirt.
+    landing_row = max([column_heights[col] - bottom for col, bottom in skirt])
+    # Create any rows the piece sticks out above the stack, bottom first so
+    # physical ids keep increasing with the logical row
+    top_row = landing_row + len(row_cols)
+    while row_index.count < top_row:
+        row_index.append()
+    rows = range(landing_row, top_row)
+    physical_rows = rows if row_index.size == row_index.count else [row_index.physical(row) for row in rows]
+    return rows, physical_rows
+
+def collides(column_blocks, physical_rows, row_cols):
+    # Check for collision at the landing position
+    for physical_row, cols in zip(physical_rows, row_cols):
+        for col in cols:
+            if physical_row in column_blocks[col]:
+                return True
+    return False
+
+def place_piece(column_blocks, column_heights, row_counts, column_rows, shape_letter, rows, physical_rows, row_cols, tops):
+    # Place the piece bottom up so each column_rows list stays in ascending
+    # physical order
+    for physical_row, cols in zip(physical_rows, row_cols):
+        for col in cols:
+            column_blocks[col][physical_row] = shape_letter  # Store the shape letter
+            column_rows[col].append(physical_row)
+        # Update row_counts
+        row_counts[physical_row] = row_counts.get(physical_row, 0) + len(cols)
+    # Every touched column now tops out inside the piece
+    landing_row = rows.start
+    for col, top in tops:
+        column_heights[col] = landing_row + top + 1
+
+def check_full_rows(row_counts, rows, physical_rows):
+    # Check only the newly occupied rows; returns logical row -> physical row
+    full_rows = {row: physical_row for row, physical_row in zip(rows, physical_rows) if row_counts[physical_row] == 10}
+    return full_rows
+
+def clear_rows(column_blocks, column_heights, row_counts, row_index, column_rows, cleared_rows):
+    # cleared_rows maps logical row -> physical row. Cleared rows are dropped
+    # from the row index, so rows above them shift down without being touched.
+    if len(cleared_rows) == row_index.count:
+        # Every row is full (often, on clear-heavy input): start over empty
+        for col in range(10):
+            column_blocks[col].clear()
+            column_rows[col].clear()
+            column_heights[col] = 0
+        row_counts.clear()
+        row_index.rebuild(0)
+        return
+    for physical_row in cleared_rows.values():
+        row_index.remove(physical_row)
+        del row_counts[physical_row]
+        for col in range(10):
+            del column_blocks[col][physical_row]
+    live = row_index.live
+    for col in range(10):
+        rows_in_col = column_rows[col]
+        if live[rows_in_col[-1]]:
+            # A full row has a block in every column, so all cleared rows
+            # are below this column's top block
+            column_heights[col] -= len(cleared_rows)
+            continue
+        # The top block was cleared: pop dead entries (including leftovers of
+        # earlier clears) down to the next live block
+        while rows_in_col and not live[rows_in_col[-1]]:
+            rows_in_col.pop()
+        if rows_in_col:
+            column_heights[col] = row_index.logical(rows_in_col[-1]) + 1
+        else:
+            column_heights[col] = 0
+    # Dead ids are never reused, so renumber once they outnumber the live
+    # rows. This keeps the index, and the dead entries left in column_rows,
+    # proportional to the stack at amortized O(1) per cleared row.
+    if row_index.size - row_index.count > row_index.count:
+        renumber_rows(column_blocks, row_counts, row_index, column_rows, row_index.physical_rows())
+
+def renumber_rows(column_blocks, row_counts, row_index, column_rows, physical_rows):
+    # Renumber physical_rows (live, ascending) from physical row 0, dropping
+    # every other row, and rebuild the row index to match
+    renumber = {physical_row: new_row for new_row, physical_row in enumerate(physical_rows)}
+    for col in range(10):
+        blocks = column_blocks[col]
+        column_blocks[col] = {renumber[physical_row]: shape_letter for physical_row, shape_letter in blocks.items() if physical_row in renumber}
+        column_rows[col] = [renumber[physical_row] for physical_row in column_rows[col] if physical_row in renumber]
+    new_row_counts = {renumber[physical_row]: count for physical_row, count in row_counts.items() if physical_row in renumber}
+    row_counts.clear()
+    row_counts.update(new_row_counts)
+    row_index.rebuild(len(renumber))
+
+# Sealed-floor compaction. No piece can reach a row below min(column_heights),
+# so those rows cannot change unless a clear drops some column below them.
+# Once they outnumber the rows still in play, all but the topmost of them are
+# folded into a single row offset and kept only as a zlib-compressed archive,
+# which keeps memory tracking the surface depth at amortized O(1) per row.
+# The topmost sealed row stays on the board as a sentinel: a column whose
+# height falls to 0 has been exposed below it, and the archive is restored.
+COMPACT_MIN_ROWS = 1024
+
+def row_text(column_blocks, physical_row):
+    # One row as 10 characters, shape letters or '.'
+    return ''.join([column_blocks[col].get(physical_row, '.') for col in range(10)])
+
+def load_rows(column_blocks, column_heights, row_counts, row_index, column_rows, texts):
+    # Rebuild the whole board from row texts, bottom first, with physical
+    # rows renumbered from 0
+    for col in range(10):
+        column_blocks[col] = {}
+        column_rows[col] = []
+    row_counts.clear()
+    for row, text in enumerate(texts):
+        count = 0
+        for col, shape_letter in enumerate(text):
+            if shape_letter != '.':
+                column_blocks[col][row] = shape_letter
+                column_rows[col].append(row)
+                count += 1
+        row_counts[row] = count
+    row_index.rebuild(len(row_counts))
+    for col in range(10):
+        column_heights[col] = column_rows[col][-1] + 1 if column_rows[col] else 0
+
+def compact_sealed_rows(column_blocks, column_heights, row_counts, row_index, column_rows, sealed):
+    # Archive the sealed rows below the sentinel into sealed and renumber the
+    # remaining ones from physical row 0. Returns the number of rows folded away.
+    floor = min(column_heights) - 1
+    if floor <= 0:
+        return 0
+    physical_rows = row_index.physical_rows()
+    sealed.append(zlib.compress(''.join([row_text(column_blocks, physical_row) for physical_row in physical_rows[:floor]]).encode()))
+    renumber_rows(column_blocks, row_counts, row_index, column_rows, physical_rows[floor:])
+    for col in range(10):
+        column_heights[col] -= floor
+    return floor
+
+def restore_sealed_rows(column_blocks, column_heights, row_counts, row_index, column_rows, sealed):
+    # Put the archived rows back under the board. Returns the number restored.
+    archived = b''.join([zlib.decompress(chunk) for chunk in sealed]).decode()
+    sealed.clear()
+    texts = [archived[start:start + 10] for start in range(0, len(archived), 10)]
+    restored = len(texts)
+    texts.extend(row_text(column_blocks, physical_row) for physical_row in row_index.physical_rows())
+    load_rows(column_blocks, column_heights, row_counts, row_index, column_rows, texts)
+    return restored
+
+def grid_lines(column_blocks, row_index, low=0):
+    # Frame lines for logical rows low and up. Every live row holds at least
+    # one block, so logical rows 0..count-1 are exactly the occupied rows.
+    count = row_index.count
+    if not count:
+        return ["(Grid is empty)"]
+    if low:
+        physical_rows = [row_index.physical(row) for row in range(low, count)]
+    else:
+        physical_rows = row_index.physical_rows()
+    lines = [f"{row:2}: {row_text(column_blocks, physical_rows[row - low])}" for row in range(count - 1, low - 1, -1)]
+    lines.append(grid_footer(low))
+    return lines
+
+def print_grid(column_blocks, row_index):
+    print('\n'.join(grid_lines(column_blocks, row_index)))
+
+FULL_ROW = 0x3FF
+
+def bitboard_drop_piece(rows, column_heights, shape_letter, left_col, visualize=False):
+    # Returns PLACED, or the status code explaining why the piece was rejected
+    placement = PLACEMENTS.get(shape_letter, {}).get(left_col)
+    if placement is None:
+        return placement_status(shape_letter)
+    skirt, tops, row_masks, _ = placement
+    landing_row = bitboard_landing_row(rows, column_heights, skirt, row_masks)
+    full_rows = bitboard_place_piece(rows, column_heights, landing_row, row_masks, tops)
+    if full_rows is None:
+        return COLLISION
+    draw = visualize and visualize.due()
+    if draw:
+        low = visualize.window(len(rows))
+        visualize.show("After dropping piece:", mask_lines(rows[low:], low))
+
+    if full_rows:
+        bitboard_clear_rows(rows, column_heights, full_rows)
+        if draw:
+            low = visualize.window(len(rows))
+            visualize.show(f"After clearing rows: {full_rows}", mask_lines(rows[low:], low))
+    return PLACED
+
+def bitboard_landing_row(rows, column_heights, skirt, row_masks):
+    # The piece rests on the highest column under its bottom skirt
+    landing_row = max([column_heights[col] - bottom for col, bottom in skirt])
+    # Every row a piece touches is non-empty, so len(rows) is the stack height
+    top_row = landing_row + len(row_masks)
+    if top_row > len(rows):
+        rows.extend(array('H', bytes(2 * (top_row - len(rows)))))
+    return landing_row
+
+def bitboard_collides(rows, landing_row, row_masks):
+    # The collision test of bitboard_place_piece on its own
+    for row, mask in enumerate(row_masks, landing_row):
+        if rows[row] & mask:
+            return True
+    return False
+
+def bitboard_place_piece(rows, column_heights, landing_row, row_masks, tops):
+    # Place the piece, testing each row for a collision just before it is
+    # written and for a full row just after (one pass). Returns the full
+    # rows, ascending, or None on a collision, which ends the game.
+    full_rows = []
+    row = landing_row
+    for mask in row_masks:
+        if rows[row] & mask:
+            return None
+        rows[row] |= mask
+        if rows[row] == FULL_ROW:
+            full_rows.append(row)
+        row += 1
+    for col, top in tops:
+        column_heights[col] = landing_row + top + 1
+    return full_rows
+
+def bitboard_clear_rows(rows, column_heights, full_rows):
+    # full_rows is ascending; delete from the top so lower indices stay valid
+    for row in reversed(full_rows):
+        del rows[row]
+    for col in range(len(column_heights)):
+        height = column_heights[col]
+        height -= sum(1 for row in full_rows if row < height)
+        # If the column's top block was cleared, walk down to the next block
+        bit = 1 << col
+        while height and not rows[height - 1] & bit:
+            height -= 1
+        column_heights[col] = height
+
+def bitboard_compact_sealed_rows(rows, column_heights, sealed):
+    # Same folding as compact_sealed_rows; rows below the sentinel are sliced off
+    floor = min(column_heights) - 1
+    if floor > 0:
+        sealed.append(zlib.compress(rows[:floor].tobytes()))
+        del rows[:floor]
+        for col in range(10):
+            column_heights[col] -= floor
+        return floor
+    return 0
+
+def bitboard_restore_sealed_rows(rows, column_heights, sealed):
+    # Put the archived rows back under the board and recompute the heights of
+    # the exposed columns. Returns the number of rows restored.
+    restored = array('H')
+    for chunk in sealed:
+        restored.frombytes(zlib.decompress(chunk))
+    sealed.clear()
+    rows[:0] = restored
+    for col in range(10):
+        if column_heights[col]:
+            column_heights[col] += len(restored)
+            continue
+        height = len(restored)
+        bit = 1 << col
+        while height and not rows[height - 1] & bit:
+            height -= 1
+        column_heights[col] = height
+    return len(restored)
+
+def print_bitboard(rows):
+    print('\n'.join(mask_lines(rows, 0)))
+
+def run_bitboard(rows, column_heights, sealed, pieces, visualize=False):
+    # Drop pieces onto an existing bitboard. Returns the change in the number
+    # of rows folded below the sealed floor, or None if a piece was rejected.
+    base_row = 0
+    compact_at = max(2 * len(rows), COMPACT_MIN_ROWS)
+
+    for shape_letter, column in pieces:
+        status = bitboard_drop_piece(rows, column_heights, shape_letter, int(column), visualize=visualize)
+        if status:
+            if visualize:
+                print(f"Error: {STATUS_MESSAGES[status]}")
+            return None
+
+        # A clear exposed a column below the sentinel row: unfold the archive
+        if sealed and 0 in column_heights:
+            base_row -= bitboard_restore_sealed_rows(rows, column_heights, sealed)
+        # Fold sealed rows away; they stay materialized for --visualize
+        if len(rows) >= compact_at and not visualize:
+            base_row += bitboard_compact_sealed_rows(rows, column_heights, sealed)
+            compact_at = max(2 * len(rows), COMPACT_MIN_ROWS)
+
+    return base_row
+
+EMPTY_HEIGHTS = (0,) * 10
+
+# Every (shape_letter, left_col) that stays inside the grid
+MOVES = tuple((shape_letter, left_col) for shape_letter, by_col in PLACEMENTS.items() for left_col in by_col)
+
+# Result of TetrisEngine.evaluate for one candidate move. Rows and heights
+# count from the bottom of the whole stack (base_row included); a rejected
+# move has its status code and None everywhere else.
+Outcome = namedtuple('Outcome', ['status', 'landing_row', 'cleared_rows', 'height', 'profile'])
+
+class TetrisEngine:
+    # Reusable bitboard game for embedding: drop pieces one at a time with
+    # drop(), or play a whole sequence with run(). reset() clears the board
+    # in place, so one engine can score any number of games.
+    __slots__ = ('rows', 'column_heights', 'base_row', 'sealed', 'compact_at')
+
+    def __init__(self):
+        self.rows = array('H')
+        self.column_heights = [0] * 10
+        self.base_row = 0  # Rows folded below the sealed floor
+        self.sealed = []   # Compressed archive of the folded rows
+        self.compact_at = COMPACT_MIN_ROWS
+
+    def reset(self):
+        del self.rows[:]
+        self.column_heights[:] = EMPTY_HEIGHTS
+        self.base_row = 0
+        self.sealed.clear()
+        self.compact_at = COMPACT_MIN_ROWS
+
+    def height(self):
+        return self.base_row + len(self.rows)
+
+    def drop(self, shape_letter, left_col):
+        # Returns the new height, or -status if the piece was rejected (see
+        # STATUS_MESSAGES). Never raises for bad shapes or columns.
+        rows = self.rows
+        column_heights = self.column_heights
+        status = bitboard_drop_piece(rows, column_heights, shape_letter, left_col)
+        if status:
+            return -status
+        if self.sealed and 0 in column_heights:
+            self.base_row -= bitboard_restore_sealed_rows(rows, column_heights, self.sealed)
+        if len(rows) >= self.compact_at:
+            self.base_row += bitboard_compact_sealed_rows(rows, column_heights, self.sealed)
+            self.compact_at = max(2 * len(rows), COMPACT_MIN_ROWS)
+        return self.base_row + len(rows)
+
+    def evaluate(self, candidates):
+        # What-if drops from the current board, which is left untouched:
+        # returns an Outcome per (shape_letter, left_col) candidate
+        return [self.evaluate_move(shape_letter, left_col) for shape_letter, left_col in candidates]
+
+    def evaluate_move(self, shape_letter, left_col):
+        # bitboard_drop_piece and bitboard_clear_rows without writing: the
+        # rows the piece touches go into a small overlay dict and the other
+        # rows are read from the board
+        placement = PLACEMENTS.get(shape_letter, {}).get(left_col)
+        if placement is None:
+            return Outcome(UNKNOWN_SHAPE if shape_letter not in PLACEMENTS else OUT_OF_BOUNDS, None, None, None, None)
+        skirt, tops, row_masks, _ = placement
+        rows = self.rows
+        landing_row = max([self.column_heights[col] - bottom for col, bottom in skirt])
+        overlay = {}
+        for row, mask in enumerate(row_masks, landing_row):
+            current = rows[row] if row < len(rows) else 0
+            if current & mask:
+                return Outcome(COLLISION, None, None, None, None)
+            overlay[row] = current | mask
+        heights = self.column_heights[:]
+        for col, top in tops:
+            heights[col] = landing_row + top + 1
+        live_rows = max(len(rows), landing_row + len(row_masks))
+
+        cleared = [row for row, mask in overlay.items() if mask == FULL_ROW]
+        for col in range(10 if cleared else 0):
+            height = heights[col]
+            if height - 1 not in overlay:
+                heights[col] = height - sum(1 for row in cleared if row < height)
+                continue
+            # The column tops out in the piece's rows; walk down past
+            # cleared and empty cells
+            bit = 1 << col
+            row = height - 1
+            while row >= 0 and (row in cleared or not overlay.get(row, rows[row] if row < len(rows) else 0) & bit):
+                row -= 1
+            if row < 0 and self.sealed:
+                # The clear would expose the archived rows: play the move
+                # for real and undo it through a snapshot
+                state = self.snapshot()
+                height = self.drop(shape_letter, left_col)
+                profile = tuple(self.base_row + height for height in self.column_heights)
+                self.restore(state)
+                return Outcome(PLACED, self.base_row + landing_row, [self.base_row + row for row in cleared], height, profile)
+            heights[col] = row + 1 - sum(1 for cleared_row in cleared if cleared_row < row)
+
+        base_row = self.base_row
+        if base_row:
+            cleared = [base_row + row for row in cleared]
+            heights = [base_row + height for height in heights]
+        return Outcome(PLACED, base_row + landing_row, cleared, base_row + live_rows - len(cleared), tuple(heights))
+
+    def run(self, pieces, visualize=False):
+        # Drop (shape_letter, column) tokens; returns the final height, or -1
+        # if a piece was rejected
+        folded = run_bitboard(self.rows, self.column_heights, self.sealed, pieces, visualize=grid_view(visualize))
+        if folded is None:
+            return -1
+        self.base_row += folded
+        self.compact_at = max(2 * len(self.rows), COMPACT_MIN_ROWS)
+        return self.base_row + len(self.rows)
+
+    def snapshot(self):
+        # Immutable copy of the board; rows is a fresh array
+        return (self.rows[:], tuple(self.column_heights), self.base_row, tuple(self.sealed))
+
+    def restore(self, state):
+        rows, column_heights, self.base_row, sealed = state
+        self.rows[:] = rows
+        self.column_heights[:] = column_heights
+        self.sealed[:] = sealed
+        self.compact_at = max(2 * len(self.rows), COMPACT_MIN_ROWS)
+
+def simulate_bitboard(pieces, visualize=False):
+    # Returns the final height, or -1 if a piece could not be placed
+    return TetrisEngine().run(pieces, visualize=visualize)
+
+# Run-length encoded board (--engine rle): rows are kept bottom up as runs
+# of identical rows, in parallel lists of row masks and repeat counts. A run
+# is only split where a piece lands or a row clears, and equal neighbours are
+# merged again afterwards, so a tall repetitive stack costs a few runs instead
+# of one entry per row. The runs are held in chunks of at most 2 * RUN_CHUNK,
+# with a Fenwick tree over the rows in each chunk: the chunk holding a row is
+# found in O(log chunks), and a piece or a row clear only rewrites the lists
+# of its own chunk and one tree path, wherever it lands in the stack. The
+# tree is rebuilt when a chunk splits, once per RUN_CHUNK new runs at most.
+RUN_CHUNK = 128
+
+class RunBoard:
+    __slots__ = ('masks', 'counts', 'totals', 'tree', 'height', 'cut_rows')
+
+    def __init__(self):
+        self.masks = [[]]   # Per chunk, bottom up
+        self.counts = [[]]
+        self.totals = [0]   # Rows in each chunk
+        self.tree = [0, 0]  # Fenwick tree over totals
+        self.height = 0
+        self.cut_rows = 0   # Rows taken by the last cut
+
+    def reindex(self):
+        # Drop empty chunks and rebuild the tree over the chunk totals
+        if 0 in self.totals and len(self.totals) > 1:
+            keep = [chunk for chunk, total in enumerate(self.totals) if total] or [0]
+            self.masks = [self.masks[chunk] for chunk in keep]
+            self.counts = [self.counts[chunk] for chunk in keep]
+            self.totals = [self.totals[chunk] for chunk in keep]
+        prefix = [0, *accumulate(self.totals)]
+        self.tree = [prefix[i] - prefix[i & (i - 1)] for i in range(len(prefix))]
+
+    def add(self, chunk, rows):
+        # Rows added to (or, negative, removed from) chunk
+        self.totals[chunk] += rows
+        tree = self.tree
+        i = chunk + 1
+        while i < len(tree):
+            tree[i] += rows
+            i += i & -i
+
+    def find(self, row):
+        # Chunk holding row, and the number of rows below that chunk
+        tree = self.tree
+        if len(tree) == 2:
+            return 0, 0  # A single chunk, as on most boards
+        chunk = 0
+        below = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = chunk + step
+            if nxt < len(tree) and below + tree[nxt] <= row:
+                chunk = nxt
+                below += tree[nxt]
+            step >>= 1
+        return chunk, below
+
+    def locate(self, chunk, row):
+        # Index of the run holding row (counted from the chunk's first row)
+        # and the first row of that run
+        counts = self.counts[chunk]
+        ends = list(accumulate(counts))
+        index = bisect_right(ends, row)
+        return index, ends[index] - counts[index]
+
+    def grow(self, height):
+        # One run of empty rows up to height, in the top chunk
+        chunk = len(self.totals) - 1
+        self.masks[chunk].append(0)
+        self.counts[chunk].append(height - self.height)
+        self.add(chunk, height - self.height)
+        self.height = height
+
+    def cut(self, low, high):
+        # Remove rows low..high-1; returns their masks and the position (chunk,
+        # run index) to put rows back at
+        chunk, below = self.find(low)
+        masks, counts = self.masks[chunk], self.counts[chunk]
+        # Pull whole runs down from the chunks above until this chunk holds
+        # all the rows
+        above = chunk
+        while below + self.totals[chunk] < high:
+            above += 1
+            if self.totals[above]:
+                masks.append(self.masks[above].pop(0))
+                counts.append(self.counts[above].pop(0))
+                self.add(above, -counts[-1])
+                self.add(chunk, counts[-1])
+                above -= 1
+        low -= below
+        index, start = self.locate(chunk, low)
+        if start < low:
+            masks.insert(index + 1, masks[index])
+            counts.insert(index + 1, counts[index] - (low - start))
+            counts[index] = low - start
+            index += 1
+        window = []
+        for _ in range(high - below - low):
+            window.append(masks[index])
+            counts[index] -= 1
+            if not counts[index]:
+                del masks[index]
+                del counts[index]
+        self.cut_rows = high - below - low
+        return window, (chunk, index)
+
+    def insert(self, position, window):
+        # Put rows back where cut took them, merging equal neighbours
+        chunk, index = position
+        masks, counts = self.masks[chunk], self.counts[chunk]
+        for mask in window:
+            if index and masks[index - 1] == mask:
+                counts[index - 1] += 1
+            else:
+                masks.insert(index, mask)
+                counts.insert(index, 1)
+                index += 1
+        if index and index < len(masks) and masks[index - 1] == masks[index]:
+            counts[index - 1] += counts[index]
+            del masks[index]
+            del counts[index]
+        rows = len(window) - self.cut_rows
+        if rows:
+            # Rows were cleared
+            self.add(chunk, rows)
+            self.height += rows
+        if len(counts) > 2 * RUN_CHUNK:
+            # Split the chunk into chunks of RUN_CHUNK runs
+            lows = range(RUN_CHUNK, len(counts), RUN_CHUNK)
+            split = [counts[low:low + RUN_CHUNK] for low in lows]
+            self.masks[chunk + 1:chunk + 1] = [masks[low:low + RUN_CHUNK] for low in lows]
+            self.counts[chunk + 1:chunk + 1] = split
+            self.totals[chunk + 1:chunk + 1] = [sum(part) for part in split]
+            del masks[RUN_CHUNK:]
+            del counts[RUN_CHUNK:]
+            self.totals[chunk] = sum(counts)
+            self.reindex()
+
+    def column_top(self, col, height):
+        # Height of column col counting only the rows below height
+        bit = 1 << col
+        if not height:
+            return 0
+        chunk, below = self.find(height - 1)
+        index, start = self.locate(chunk, height - 1 - below)
+        masks, counts = self.masks[chunk], self.counts[chunk]
+        if masks[index] & bit:
+            return height
+        row = below + start  # First row of run index
+        while True:
+            index -= 1
+            while index < 0:
+                chunk -= 1
+                if chunk < 0:
+                    return 0
+                masks, counts = self.masks[chunk], self.counts[chunk]
+                index = len(masks) - 1
+            if masks[index] & bit:
+                return row
+            row -= counts[index]
+
+    def tail(self, low):
+        # Masks of rows low..height-1, bottom up
+        masks = []
+        row = self.height
+        chunk = len(self.totals)
+        while row > low:
+            chunk -= 1
+            counts = self.counts[chunk]
+            index = len(counts)
+            while index and row > low:
+                index -= 1
+                take = min(counts[index], row - low)
+                masks.extend(repeat(self.masks[chunk][index], take))
+                row -= take
+        masks.reverse()
+        return masks
+
+def rle_clear_rows(board, column_heights, full_rows):
+    # full_rows is ascending and lies within one piece's rows
+    window, index = board.cut(full_rows[0], full_rows[-1] + 1)
+    board.insert(index, [mask for mask in window if mask != FULL_ROW])
+    for col in range(10):
+        height = column_heights[col]
+        if height <= full_rows[0]:
+            continue
+        top_cleared = height - 1 in full_rows
+        height -= sum(1 for row in full_rows if row < height)
+        if top_cleared:
+            # The column's top block was cleared; walk down to the next block
+            height = board.column_top(col, height)
+        column_heights[col] = height
+
+def rle_drop_piece(board, column_heights, shape_letter, left_col, visualize=False):
+    # bitboard_drop_piece on runs: the piece's rows are cut out as single
+    # rows, filled, and put back
+    placements = PLACEMENTS.get(shape_letter)
+    if placements is None:
+        return UNKNOWN_SHAPE
+    placement = placements.get(left_col)
+    if placement is None:
+        return OUT_OF_BOUNDS
+    skirt, tops, row_masks, _ = placement
+
+    landing_row = max([column_heights[col] - bottom for col, bottom in skirt])
+    top_row = landing_row + len(row_masks)
+    if top_row > board.height:
+        # Empty rows for the piece to fill; every one of them gets a cell
+        board.grow(top_row)
+    window, index = board.cut(landing_row, top_row)
+
+    full_rows = []
+    for offset, mask in enumerate(row_masks):
+        if window[offset] & mask:
+            return COLLISION
+        window[offset] |= mask
+        if window[offset] == FULL_ROW:
+            full_rows.append(landing_row + offset)
+    board.insert(index, window)
+    for col, top in tops:
+        column_heights[col] = landing_row + top + 1
+
+    draw = visualize and visualize.due()
+    if draw:
+        low = visualize.window(board.height)
+        visualize.show("After dropping piece:", mask_lines(board.tail(low), low))
+
+    if full_rows:
+        rle_clear_rows(board, column_heights, full_rows)
+        if draw:
+            low = visualize.window(board.height)
+            visualize.show(f"After clearing rows: {full_rows}", mask_lines(board.tail(low), low))
+    return PLACED
+
+def simulate_rle(pieces, visualize=False):
+    # Returns the final height, or -1 if a piece could not be placed
+    board = RunBoard()
+    column_heights = [0] * 10
+    for shape_letter, column in pieces:
+        status = rle_drop_piece(board, column_heights, shape_letter, int(column), visualize=visualize)
+        if status:
+            if visualize:
+                print(f"Error: {STATUS_MESSAGES[status]}")
+            return -1
+    return board.height
+
+# Wide boards (--width). Rows are Python ints used as bit masks, so a
+# collision test or full-row check is a single big-int operation at any
+# width; the engine otherwise follows the bitboard engine step for step,
+# including sealed-floor compaction (rows are archived as fixed-size
+# little-endian integers).
+
+def wide_drop_piece(rows, column_heights, placements, full_row, shape_letter, left_col, visualize=False):
+    # bitboard_drop_piece with the placement table and full-row mask of the
+    # board's width
+    placements = placements.get(shape_letter)
+    if placements is None:
+        return UNKNOWN_SHAPE
+    placement = placements.get(left_col)
+    if placement is None:
+        return OUT_OF_BOUNDS
+    skirt, tops, row_masks, _ = placement
+
+    landing_row = max([column_heights[col] - bottom for col, bottom in skirt])
+    top_row = landing_row + len(row_masks)
+    if top_row > len(rows):
+        rows.extend([0] * (top_row - len(rows)))
+
+    full_rows = []
+    row = landing_row
+    for mask in row_masks:
+        if rows[row] & mask:
+            return COLLISION
+        rows[row] |= mask
+        if rows[row] == full_row:
+            full_rows.append(row)
+        row += 1
+    for col, top in tops:
+        column_heights[col] = landing_row + top + 1
+    draw = visualize and visualize.due()
+    if draw:
+        low = visualize.window(len(rows))
+        visualize.show("After dropping piece:", mask_lines(rows[low:], low, len(column_heights)))
+
+    if full_rows:
+        bitboard_clear_rows(rows, column_heights, full_rows)
+        if draw:
+            low = visualize.window(len(rows))
+            visualize.show(f"After clearing rows: {full_rows}", mask_lines(rows[low:], low, len(column_heights)))
+    return PLACED
+
+def wide_compact_sealed_rows(rows, column_heights, sealed):
+    floor = min(column_heights) - 1
+    if floor > 0:
+        row_bytes = (len(column_heights) + 7) // 8
+        sealed.append(zlib.compress(b''.join([row.to_bytes(row_bytes, 'little') for row in rows[:floor]])))
+        del rows[:floor]
+        for col in range(len(column_heights)):
+            column_heights[col] -= floor
+        return floor
+    return 0
+
+def wide_restore_sealed_rows(rows, column_heights, sealed):
+    row_bytes = (len(column_heights) + 7) // 8
+    restored = []
+    for chunk in sealed:
+        data = zlib.decompress(chunk)
+        restored.extend([int.from_bytes(data[i:i + row_bytes], 'little') for i in range(0, len(data), row_bytes)])
+    sealed.clear()
+    rows[:0] = restored
+    for col in range(len(column_heights)):
+        if column_heights[col]:
+            column_heights[col] += len(restored)
+            continue
+        height = len(restored)
+        bit = 1 << col
+        while height and not rows[height - 1] & bit:
+            height -= 1
+        column_heights[col] = height
+    return len(restored)
+
+def simulate_wide(pieces, width, visualize=False):
+    # Returns the final height, or -1 if a piece could not be placed
+    placements = placements_for(width)
+    full_row = (1 << width) - 1
+    rows = []
+    column_heights = [0] * width
+    base_row = 0
+    sealed = []
+    compact_at = COMPACT_MIN_ROWS
+    for shape_letter, column in pieces:
+        status = wide_drop_piece(rows, column_heights, placements, full_row, shape_letter, int(column), visualize=visualize)
+        if status:
+            if visualize:
+                print(f"Error: {STATUS_MESSAGES[status]}")
+            return -1
+        if sealed and 0 in column_heights:
+            base_row -= wide_restore_sealed_rows(rows, column_heights, sealed)
+        if len(rows) >= compact_at and not visualize:
+            base_row += wide_compact_sealed_rows(rows, column_heights, sealed)
+            compact_at = max(2 * len(rows), COMPACT_MIN_ROWS)
+    return base_row + len(rows)
+
+def simulate_dict(pieces, visualize=False):
+    # Returns the final height, or -1 if a piece could not be placed
+    column_blocks = [{} for _ in range(10)]
+    column_heights = [0] * 10
+    row_counts = {}  # Maintain a persistent row_counts dictionary
+    row_index = RowIndex()  # Logical row <-> physical row (column_blocks/row_counts key)
+    column_rows = [[] for _ in range(10)]  # Physical rows of each column's blocks, ascending
+    base_row = 0  # Rows folded below the sealed floor
+    sealed = []  # Compressed archive of the folded rows
+    compact_at = COMPACT_MIN_ROWS
+
+    for shape_letter, column in pieces:
+        status = drop_piece(column_blocks, column_heights, shape_letter, int(column), row_counts, row_index, column_rows, visualize=visualize)
+        if status:
+            if visualize:
+                print(f"Error: {STATUS_MESSAGES[status]}")
+            return -1
+
+        # A clear exposed a column below the sentinel row: unfold the archive
+        if sealed and 0 in column_heights:
+            base_row -= restore_sealed_rows(column_blocks, column_heights, row_counts, row_index, column_rows, sealed)
+        # Fold sealed rows away; they stay materialized for --visualize
+        if row_index.count >= compact_at and not visualize:
+            base_row += compact_sealed_rows(column_blocks, column_heights, row_counts, row_index, column_rows, sealed)
+            compact_at = max(2 * row_index.count, COMPACT_MIN_ROWS)
+
+    # Determine the final height: every live row is occupied
+    height = base_row + row_index.count
+    return height
+
+def simulate_numpy(pieces, visualize=False):
+    # One game through the batched NumPy engine (optional dependency); its
+    # real use is whole batches, see run()
+    import tetris_numpy
+    line = ','.join([shape_letter + (column.decode() if isinstance(column, bytes) else column) for shape_letter, column in pieces])
+    return tetris_numpy.simulate_lines([line])[0]
+
+def simulate_benchmark(pieces, visualize=False):
+    # The pre-optimized engine in tetris_benchmark.py, O(H) per piece; kept
+    # as the reference the other engines are checked against
+    import tetris_benchmark
+    return tetris_benchmark.simulate(pieces)
+
+# Engine registry. Every engine is a function (pieces, visualize=False) that
+# returns the final height, or -1 if a piece could not be placed; --engine
+# NAME picks one, and tetris_verify.py plays the same games through several
+# and compares them. register_engine adds an implementation from outside.
+ENGINES = {
+    'dict': simulate_dict,
+    'bitboard': simulate_bitboard,
+    'rle': simulate_rle,
+    'numpy': simulate_numpy,
+    'benchmark': simulate_benchmark,
+}
+
+# Engines that can draw --visualize frames
+VISUAL_ENGINES = ('dict', 'bitboard', 'rle')
+
+def register_engine(name, simulate_function):
+    ENGINES[name] = simulate_function
+
+def simulate(pieces, visualize=False, engine='dict', width=10):
+    # pieces is an iterable of (shape_letter, column) tokens, e.g. from
+    # parse_line or read_games; column is the column text (str or bytes).
+    # Returns the final height, or -1 if a piece could not be placed.
+    visualize = grid_view(visualize)
+    if width != 10:
+        return simulate_wide(pieces, width, visualize=visualize)
+    return ENGINES[engine](pieces, visualize=visualize)
+
+def process_pieces(pieces, visualize=False, engine='dict', sink=None, width=10):
+    height = simulate(pieces, visualize=visualize, engine=engine, width=width)
+    if sink is None:
+        print(height)
+    else:
+        sink.write(height)
+
+def parse_line(line):
+    # Split one input line into (shape_letter, column) tokens
+    for piece_entry in line.strip().split(','):
+        if piece_entry:
+            yield piece_entry[0], piece_entry[1:]
+
+def process_line(line, visualize=False, engine='dict', sink=None, width=10):
+    process_pieces(parse_line(line), visualize=visualize, engine=engine, sink=sink, width=width)
+
+# Result output: heights are formatted into a pre-sized buffer and written to
+# sys.stdout.buffer in large blocks, when the buffer fills up or when
+# SINK_FLUSH_SECONDS have passed since the last write so slow games still
+# show progress. Interactive runs (a terminal, or --visualize with its grids
+# on the same stream) get line-buffered text output instead.
+SINK_BUFFER_BYTES = 1 << 16
+SINK_FLUSH_SECONDS = 0.5
+
+class ResultSink:
+    __slots__ = ('out', 'buffer', 'pos', 'interval', 'deadline')
+
+    def __init__(self, out, size=SINK_BUFFER_BYTES, interval=SINK_FLUSH_SECONDS):
+        self.out = out
+        self.buffer = bytearray(size)
+        self.pos = 0
+        self.interval = interval
+        self.deadline = monotonic() + interval
+
+    def write(self, height):
+        data = b'%d\n' % height
+        end = self.pos + len(data)
+        if end > len(self.buffer):
+            self.flush()
+            end = len(data)
+        self.buffer[self.pos:end] = data
+        self.pos = end
+        if monotonic() >= self.deadline:
+            self.flush()
+
+    def flush(self):
+        if self.pos:
+            with memoryview(self.buffer) as view:
+                self.out.write(view[:self.pos])
+            self.pos = 0
+        self.out.flush()
+        self.deadline = monotonic() + self.interval
+
+    close = flush
+
+class LineSink:
+    __slots__ = ('out',)
+
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, height):
+        self.out.write(f"{height}\n")
+
+    def flush(self):
+        self.out.flush()
+
+    close = flush
+
+def open_sink(visualize=False):
+    if visualize or sys.stdout.isatty():
+        return LineSink(sys.stdout)
+    return ResultSink(sys.stdout.buffer)
+
+# Height tracing: --trace-heights writes the height after every piece of a
+# game as one comma-separated line, in chunks of TRACE_CHUNK_PIECES values
+# through a binary buffered writer. A rejected piece is written as -1 and
+# ends its game.
+TRACE_CHUNK_PIECES = 1 << 12
+
+def trace_heights(pieces, engine, out):
+    engine.reset()
+    drop = engine.drop
+    heights = []
+    separator = b''
+    for shape_letter, column in pieces:
+        try:
+            height = drop(shape_letter, int(column))
+        except ValueError:
+            height = -1
+        if height < 0:
+            heights.append(-1)
+            break
+        heights.append(height)
+        if len(heights) == TRACE_CHUNK_PIECES:
+            out.write(separator + ','.join(map(str, heights)).encode())
+            heights.clear()
+            separator = b','
+    if heights:
+        out.write(separator + ','.join(map(str, heights)).encode())
+    out.write(b'\n')
+
+# Parallel batch mode: lines are independent games, so --jobs spreads them
+# across a process pool. Lines are shipped in batches of roughly
+# JOB_BATCH_CHARS characters so tiny games are not dominated by IPC cost.
+JOB_BATCH_CHARS = 1 << 16
+
+def solve_lines(lines, engine='dict', width=10):
+    # Worker entry point: one result per line, any error becomes -1
+    results = []
+    for line in lines:
+        try:
+            results.append(simulate(parse_line(line), engine=engine, width=width))
+        except Exception:
+            results.append(-1)
+    return results
+
+def batch_lines(lines, batch_chars=JOB_BATCH_CHARS):
+    batch = []
+    size = 0
+    for line in lines:
+        batch.append(line)
+        size += len(line) + 1
+        if size >= batch_chars:
+            yield batch
+            batch = []
+            size = 0
+    if batch:
+        yield batch
+
+def process_lines_parallel(lines, jobs, engine='dict', sink=None, width=10):
+    # imap keeps the batches, and therefore the output, in input order
+    import multiprocessing
+    from functools import partial
+    write = print if sink is None else sink.write
+    with multiprocessing.Pool(jobs) as pool:
+        for results in pool.imap(partial(solve_lines, engine=engine, width=width), batch_lines(lines)):
+            for height in results:
+                write(height)
+
+# Streaming input: stdin is read in fixed-size binary chunks and split into
+# tokens as it arrives, so peak memory no longer depends on line length
+STREAM_CHUNK_SIZE = 1 << 16
+
+def split_tokens(data, line_start, line_end):
+    # Mirror parse_line: only the ends of a whole line are stripped
+    if line_start:
+        data = data.lstrip()
+    if line_end:
+        data = data.rstrip()
+    for piece_entry in data.split(b','):
+        if piece_entry:
+            yield chr(piece_entry[0]), piece_entry[1:]
+
+def iter_tokens(stream, chunk_size=STREAM_CHUNK_SIZE):
+    # Yields (shape_letter, column) tokens, and None at the end of each line.
+    # Only the unfinished last token of a chunk is carried into the next one.
+    carry = b''
+    line_start = True  # No token of the current line has been emitted yet
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        segments = (carry + chunk).split(b'\n')
+        carry = segments.pop()
+        for segment in segments:
+            yield from split_tokens(segment, line_start, True)
+            yield None
+            line_start = True
+        if b',' in carry:
+            head, _, carry = carry.rpartition(b',')
+            yield from split_tokens(head, line_start, False)
+            line_start = False
+    if carry or not line_start:
+        yield from split_tokens(carry, line_start, True)
+        yield None
+
+def read_games(stream, chunk_size=STREAM_CHUNK_SIZE):
+    # Yields one token iterator per input line. Each must be exhausted before
+    # the next one is requested, since they share the underlying stream.
+    tokens = iter_tokens(stream, chunk_size)
+    next_token = tokens.__next__
+    for token in tokens:
+        if token is None:
+            yield iter(())
+        else:
+            yield chain((token,), iter(next_token, None))
+
+def process_games(games, visualize=False, engine='dict', sink=None, width=10):
+    # Print the result of each token iterator from read_games
+    for pieces in games:
+        try:
+            process_pieces(pieces, visualize=visualize, engine=engine, sink=sink, width=width)
+        except Exception as e:
+            if sink is None:
+                print("-1")
+            else:
+                sink.write(-1)
+        # Skip whatever is left of the line after an error
+        for _ in pieces:
+            pass
+
+# Memory-mapped input: --input FILE maps the file instead of reading stdin.
+# A sidecar FILE.idx holds the byte offset of every line start, so a run can
+# resume from any line and hand whole-line byte ranges to workers. Lines are
+# tokenized from the map in chunks, without building per-line str objects.
+INDEX_SUFFIX = '.idx'
+MAPPED_BATCH_BYTES = 1 << 20
+
+class MappedReader:
+    # Minimal file-like object over a byte range, for read_games
+    __slots__ = ('view', 'pos', 'end')
+
+    def __init__(self, view, start, end):
+        self.view = view
+        self.pos = start
+        self.end = end
+
+    def read(self, size):
+        start = self.pos
+        self.pos = min(self.end, start + size)
+        return self.view[start:self.pos].tobytes()
+
+def map_file(path):
+    # Read-only map of the whole file (mmap cannot map an empty file)
+    import mmap
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def build_line_index(data):
+    # Byte offset of every line start
+    offsets = array('Q')
+    if not len(data):
+        return offsets
+    offsets.append(0)
+    last = len(data) - 1
+    pos = data.find(b'\n')
+    while 0 <= pos < last:
+        offsets.append(pos + 1)
+        pos = data.find(b'\n', pos + 1)
+    return offsets
+
+def load_line_index(path, data):
+    # The sidecar index starts with the file size and mtime it was built
+    # for; a stale or unreadable index is rebuilt and saved again
+    header = array('Q', [len(data), os.stat(path).st_mtime_ns])
+    index_path = path + INDEX_SUFFIX
+    try:
+        with open(index_path, 'rb') as f:
+            stored = array('Q', f.read())
+        if stored[:2] == header:
+            return stored[2:]
+    except (OSError, ValueError):
+        pass
+    offsets = build_line_index(data)
+    try:
+        with open(index_path + '.tmp', 'wb') as f:
+            header.tofile(f)
+            offsets.tofile(f)
+        os.replace(index_path + '.tmp', index_path)
+    except OSError:
+        pass  # Read-only location: keep the index in memory only
+    return offsets
+
+def mapped_games(data, start, end):
+    # read_games over data[start:end], which must hold whole lines
+    return read_games(MappedReader(memoryview(data), start, end))
+
+def line_ranges(offsets, size, start_line=0, batch_bytes=MAPPED_BATCH_BYTES):
+    # Whole-line (start, end) byte ranges of about batch_bytes each
+    line = start_line
+    while line < len(offsets):
+        start = offsets[line]
+        line = max(bisect_left(offsets, start + batch_bytes), line + 1)
+        yield start, offsets[line] if line < len(offsets) else size
+
+def solve_mapped_range(path, engine, width, byte_range):
+    # Worker entry point: one result per line of the range
+    results = []
+    for pieces in mapped_games(map_file(path), *byte_range):
+        try:
+            results.append(simulate(pieces, engine=engine, width=width))
+        except Exception:
+            results.append(-1)
+        for _ in pieces:
+            pass
+    return results
+
+def process_mapped_parallel(path, ranges, jobs, engine='dict', sink=None, width=10):
+    import multiprocessing
+    from functools import partial
+    write = print if sink is None else sink.write
+    with multiprocessing.Pool(jobs) as pool:
+        for results in pool.imap(partial(solve_mapped_range, path, engine, width), ranges):
+            for height in results:
+                write(height)
+
+# Prefix-sharing cache: lines often extend an earlier line, so bitboard states
+# are snapshotted in a trie and a new line resumes from the deepest cached
+# prefix instead of replaying from an empty board. Trie edges are whole chunks
+# of comma-separated entries, from one multiple of the snapshot interval to
+# the next (or to the end of the line that added them), keyed by the chunk's
+# text, so a path costs one node per snapshot and nodes are counted against
+# the cap with their keys.
+PREFIX_CACHE_MB = 64
+PREFIX_CACHE_INTERVAL = 64  # Snapshot every N pieces, plus at the end of each line
+PREFIX_NODE_BYTES = 200     # Rough per-node cost counted against the cap, plus the key
+
+class PrefixNode:
+    __slots__ = ('parent', 'key', 'children', 'lengths', 'state')
+
+    def __init__(self, parent, key):
+        self.parent = parent
+        self.key = key
+        self.children = {}  # Chunk text -> PrefixNode
+        self.lengths = {}   # Chunk length in entries -> number of children
+        self.state = None  # TetrisEngine snapshot after this prefix
+
+class PrefixCache:
+    # Snapshots are evicted in LRU order once snapshots plus trie nodes
+    # exceed max_bytes; branches left without snapshots are pruned. A line
+    # whose next node does not fit even in an otherwise empty cache is played
+    # on without caching the rest of it.
+    def __init__(self, max_bytes=PREFIX_CACHE_MB << 20, interval=PREFIX_CACHE_INTERVAL):
+        from collections import OrderedDict
+        self.root = PrefixNode(None, '')
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.snapshots = OrderedDict()  # node -> size in bytes, oldest first
+        self.size = 0
+
+    def lookup(self, entries):
+        # Deepest cached node along a line's entries and its depth
+        node = self.root
+        best, best_depth = None, 0
+        depth = 0
+        while depth < len(entries) and node.children:
+            boundary = (depth // self.interval + 1) * self.interval
+            for length in sorted(node.lengths, reverse=True):
+                if length <= boundary - depth and depth + length <= len(entries):
+                    child = node.children.get(','.join(entries[depth:depth + length]))
+                    if child is not None:
+                        break
+            else:
+                break
+            node = child
+            depth += length
+            if node.state is not None:
+                best, best_depth = node, depth
+        if best is not None:
+            self.snapshots.move_to_end(best)
+        return best, best_depth
+
+    def extend(self, node, entries):
+        # Child of node for one chunk of entries, created if needed. Returns
+        # None, leaving the trie under the cap, if it cannot fit.
+        key = ','.join(entries)
+        child = node.children.get(key)
+        if child is None:
+            child = node.children[key] = PrefixNode(node, key)
+            node.lengths[len(entries)] = node.lengths.get(len(entries), 0) + 1
+            self.size += PREFIX_NODE_BYTES + len(key)
+            # child keeps its own path alive while older snapshots go
+            while self.size > self.max_bytes and self.snapshots:
+                self.evict()
+            if self.size > self.max_bytes:
+                self.prune(child)
+                return None
+        return child
+
+    def store(self, node, state):
+        # state is a TetrisEngine snapshot
+        if node.state is None:
+            rows, _, _, sealed = state
+            size = rows.itemsize * len(rows) + sum(len(chunk) for chunk in sealed) + 100
+            self.snapshots[node] = size
+            self.size += size
+        else:
+            self.snapshots.move_to_end(node)
+        node.state = state
+        # The newest snapshot is kept: the caller may still extend from it
+        while self.size > self.max_bytes and len(self.snapshots) > 1:
+            self.evict()
+
+    def trim(self):
+        # Back under the cap once the newest snapshot is no longer extended
+        while self.size > self.max_bytes and self.snapshots:
+            self.evict()
+
+    def evict(self):
+        node, size = self.snapshots.popitem(last=False)
+        node.state = None
+        self.size -= size
+        self.prune(node)
+
+    def prune(self, node):
+        # Remove nodes that no longer lead to any snapshot
+        while node is not self.root and node.state is None and not node.children:
+            parent = node.parent
+            del parent.children[node.key]
+            length = node.key.count(',') + 1
+            parent.lengths[length] -= 1
+            if not parent.lengths[length]:
+                del parent.lengths[length]
+            self.size -= PREFIX_NODE_BYTES + len(node.key)
+            node = parent
+
+def simulate_cached(line, cache):
+    # Bitboard simulation that resumes from, and feeds, the prefix cache.
+    # Works on the split entries, as parse_line does, so a long line costs no
+    # more memory than it does uncached.
+    entries = line.strip().split(',')
+    node, depth = cache.lookup(entries)
+    engine = TetrisEngine()
+    if node is None:
+        node = cache.root
+    else:
+        engine.restore(node.state)
+
+    interval = cache.interval
+    height = engine.height()
+    while depth < len(entries):
+        end = min(len(entries), (depth // interval + 1) * interval)
+        height = engine.run((entry[0], entry[1:]) for entry in islice(entries, depth, end) if entry)
+        if height < 0:
+            break
+        node = cache.extend(node, entries[depth:end])
+        depth = end
+        if node is None:
+            # Over the cap even with every other snapshot evicted
+            if depth < len(entries):
+                height = engine.run((entry[0], entry[1:]) for entry in islice(entries, depth, None) if entry)
+            break
+        cache.store(node, engine.snapshot())
+    cache.trim()
+    return height
+
+# Cycle fast-forward: generated workloads often repeat one short pattern
+# thousands of times. A line whose text has a token-aligned period is played
+# one repetition at a time, and the surface state at each repetition boundary
+# (column heights and rows from CYCLE_MARGIN rows under the lowest column up)
+# is hashed. Once a state recurs, the run jumps forward by whole cycles and
+# adds the height gained per cycle.
+CYCLE_WINDOW = 256           # Characters matched when looking for the period
+CYCLE_CANDIDATES = 8         # Candidate periods checked per line
+CYCLE_COMPARE_CHUNK = 1 << 20
+CYCLE_MARGIN = 16            # Rows kept under the lowest column in a state
+CYCLE_MAX_DEPTH = 4096       # Deeper surfaces are not worth hashing
+CYCLE_MAX_PIECES = 1 << 16   # Pieces played while looking for a cycle
+
+def common_prefix(text, offset):
+    # Length of the common prefix of text and text[offset:], compared in
+    # chunks so a long match never copies more than one chunk at a time
+    length = 0
+    end = len(text) - offset
+    while length < end:
+        size = min(CYCLE_COMPARE_CHUNK, end - length)
+        if text.startswith(text[offset + length:offset + length + size], length):
+            length += size
+            continue
+        matched, mismatched = 0, size
+        while mismatched - matched > 1:
+            middle = (matched + mismatched) // 2
+            if text.startswith(text[offset + length:offset + length + middle], length):
+                matched = middle
+            else:
+                mismatched = middle
+        return length + matched
+    return length
+
+def find_period(text):
+    # Returns (period, span) such that text[:span] repeats text[:period] at
+    # least twice and period ends on a token boundary, or (0, 0). Among the
+    # first few candidates the one covering the most text wins.
+    window = text[:min(CYCLE_WINDOW, len(text) // 2)]
+    best = (0, 0)
+    if not window:
+        return best
+    period = text.find(window, 1)
+    for _ in range(CYCLE_CANDIDATES):
+        if period < 0 or 2 * period > len(text) or best[1] == len(text):
+            break
+        if text[period - 1] == ',':
+            span = period + common_prefix(text, period)
+            if span >= 2 * period and span > best[1]:
+                best = (period, span)
+        period = text.find(window, period + 1)
+    return best
+
+def simulate_periodic(line):
+    # Bitboard simulation of one line that skips over repeated cycles
+    text = line.strip() + ','
+    period, span = find_period(text)
+    unit = list(parse_line(text[:period]))
+    if not unit:
+        return simulate_bitboard(parse_line(line))
+    repeats = span // period
+
+    rows = array('H')
+    column_heights = [0] * 10
+    base_row = 0
+    seen = {}  # State -> (repetition, floor)
+    done = 0
+    while done < repeats and done * len(unit) < CYCLE_MAX_PIECES:
+        floor = max(0, min(column_heights) - CYCLE_MARGIN)
+        if len(rows) - floor > CYCLE_MAX_DEPTH:
+            break
+        state = (tuple(height - floor for height in column_heights), rows[floor:].tobytes())
+        if state in seen:
+            start, start_floor = seen[state]
+            cycles = (repeats - done) // (done - start)
+            base_row += cycles * (floor - start_floor)
+            done += cycles * (done - start)
+            break
+
+        lowest = len(rows)
+        for shape_letter, column in unit:
+            if bitboard_drop_piece(rows, column_heights, shape_letter, int(column)):
+                return -1
+            lowest = min(lowest, *column_heights)
+        # A repetition whose columns never sank to the floor did not look at
+        # the rows below it, so it replays the same way from the same state
+        if floor and lowest <= floor:
+            seen.clear()
+        else:
+            seen[state] = (done, floor)
+        done += 1
+
+    pieces = chain(chain.from_iterable(repeat(unit, repeats - done)), parse_line(text[repeats * period:]))
+    folded = run_bitboard(rows, column_heights, [], pieces)
+    if folded is None:
+        return -1
+    return base_row + folded + len(rows)
+
+def main():
+    if len(sys.argv) == 1:
+        # Fast start: without flags the parser would only produce defaults
+        sink = open_sink()
+        try:
+            process_stdin(sink)
+        finally:
+            sink.close()
+        return
+
+    import argparse
+    parser = argparse.ArgumentParser(description="Optimized Tetris Engine with Visualization")
+    parser.add_argument('--visualize', action='store_true', help="Enable grid visualization after each piece is dropped")
+    parser.add_argument('--visualize-rows', type=int, metavar='K', help="With --visualize, show only the top K rows of the stack")
+    parser.add_argument('--visualize-every', type=int, default=1, metavar='N', help="With --visualize, show only every Nth piece")
+    parser.add_argument('--visualize-ansi', action='store_true', help="With --visualize, redraw frames in place, rewriting only changed rows (ANSI terminals)")
+    parser.add_argument('--engine', choices=sorted(ENGINES), help="Engine: per-column dicts, row bitmasks, run-length encoded rows, NumPy lockstep batches, the pre-optimized benchmark, or any registered engine (default dict, or bitboard with the flags built on it)")
+    parser.add_argument('--width', type=int, default=10, help="Board width in columns; widths other than 10 keep rows as Python ints (bitboard engine)")
+    parser.add_argument('--stream', action='store_true', help="Tokenize stdin in fixed-size chunks instead of reading whole lines")
+    parser.add_argument('--jobs', type=int, default=1, help="Process lines in parallel with N worker processes (output stays in input order)")
+    parser.add_argument('--prefix-cache', type=int, nargs='?', const=PREFIX_CACHE_MB, metavar='MB', help="Resume lines from cached board states of shared piece prefixes (bitboard engine, default cap %(const)s MB)")
+    parser.add_argument('--fast-forward', action='store_true', help="Skip repeated cycles in lines that repeat one pattern (bitboard engine)")
+    parser.add_argument('--stats', nargs='?', const='counters', choices=['counters', 'timers'], help="Write a JSON report of engine counters (and per-phase timers with 'timers') to stderr")
+    parser.add_argument('--latency-report', metavar='FILE', help="Time every line: write a JSON latency histogram to stderr and the slowest lines to FILE")
+    parser.add_argument('--slow-lines', type=int, default=10, metavar='K', help="With --latency-report, the number of slowest lines written to FILE")
+    parser.add_argument('--trace-heights', action='store_true', help="Write the height after every piece instead of only the final height (bitboard engine)")
+    parser.add_argument('--input', metavar='FILE', help="Memory-map FILE instead of reading stdin; a line index is cached in FILE%s" % INDEX_SUFFIX)
+    parser.add_argument('--start-line', type=int, default=0, metavar='K', help="With --input, skip the first K lines")
+    parser.add_argument('--serve', metavar='ADDR', help="Serve requests on a socket (HOST:PORT, :PORT or unix:PATH) instead of reading stdin; see tetris_server.py")
+    parser.add_argument('--max-sessions', type=int, default=1024, help="With --serve, the most game sessions kept open at once")
+    parser.add_argument('--idle-timeout', type=float, default=300.0, metavar='SECONDS', help="With --serve, evict sessions unused for this long")
+    parser.add_argument('--checkpoint', metavar='FILE', help="Periodically save the game state to FILE (bitboard engine)")
+    parser.add_argument('--checkpoint-every', type=int, default=1 << 20, metavar='K', help="With --checkpoint, save after every K pieces")
+    parser.add_argument('--checkpoint-seconds', type=float, default=60.0, metavar='T', help="With --checkpoint, save at least every T seconds")
+    parser.add_argument('--resume', action='store_true', help="Continue from the --checkpoint file, skipping the lines and pieces it covers")
+    parser.add_argument('--write-tables', action='store_true', help="Regenerate the cached placement tables in %s from SHAPES and exit" % os.path.basename(TABLES_MODULE))
+    args = parser.parse_args()
+    if args.write_tables:
+        write_tables()
+        return
+    if args.engine is None:
+        # Flags built on the bitboard engine select it unless another engine is named
+        bitboard_only = args.width != 10 or args.prefix_cache is not None or args.fast_forward or args.trace_heights or args.checkpoint is not None
+        args.engine = 'bitboard' if bitboard_only else 'dict'
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.visualize and args.engine not in VISUAL_ENGINES:
+        parser.error(f"--visualize requires --engine {', '.join(VISUAL_ENGINES)}")
+    if args.width != 10:
+        if args.width < 4:
+            parser.error("--width must be at least 4")
+        if args.engine != 'bitboard':
+            parser.error(f"--width other than 10 requires the bitboard engine, not --engine {args.engine}")
+        if args.prefix_cache is not None or args.fast_forward or args.trace_heights or args.stats is not None or args.latency_report is not None or args.checkpoint is not None or args.serve is not None:
+            parser.error("--width other than 10 cannot be combined with --prefix-cache, --fast-forward, --trace-heights, --stats, --latency-report, --checkpoint or --serve")
+    if (args.visualize_rows is not None or args.visualize_every != 1 or args.visualize_ansi) and not args.visualize:
+        parser.error("--visualize-rows, --visualize-every and --visualize-ansi require --visualize")
+    if (args.visualize_rows is not None and args.visualize_rows < 1) or args.visualize_every < 1:
+        parser.error("--visualize-rows and --visualize-every must be positive")
+    if args.jobs > 1 and (args.visualize or args.stream):
+        parser.error("--jobs cannot be combined with --visualize or --stream")
+    if args.start_line < 0:
+        parser.error("--start-line must not be negative")
+    if args.start_line and args.input is None:
+        parser.error("--start-line requires --input")
+    if args.input is not None:
+        if args.engine == 'numpy' or args.prefix_cache is not None or args.fast_forward or args.trace_heights or args.stats is not None:
+            parser.error("--input cannot be combined with --engine numpy, --prefix-cache, --fast-forward, --trace-heights or --stats")
+        if not os.path.isfile(args.input):
+            parser.error(f"--input {args.input}: no such file")
+    if args.prefix_cache is not None:
+        if args.engine != 'bitboard':
+            parser.error(f"--prefix-cache requires the bitboard engine, not --engine {args.engine}")
+        if args.visualize or args.stream or args.jobs > 1:
+            parser.error("--prefix-cache cannot be combined with --visualize, --stream or --jobs")
+
+    if args.fast_forward:
+        if args.engine != 'bitboard':
+            parser.error(f"--fast-forward requires the bitboard engine, not --engine {args.engine}")
+        if args.visualize or args.stream or args.jobs > 1 or args.prefix_cache is not None:
+            parser.error("--fast-forward cannot be combined with --visualize, --stream, --jobs or --prefix-cache")
+
+    if args.trace_heights:
+        if args.engine != 'bitboard':
+            parser.error(f"--trace-heights requires the bitboard engine, not --engine {args.engine}")
+        if args.visualize or args.jobs > 1 or args.prefix_cache is not None or args.fast_forward or args.stats is not None:
+            parser.error("--trace-heights cannot be combined with --visualize, --jobs, --prefix-cache, --fast-forward or --stats")
+    if args.stats is not None:
+        if args.engine not in ('dict', 'bitboard'):
+            parser.error("--stats requires --engine dict or bitboard")
+        if args.visualize or args.stream or args.jobs > 1 or args.prefix_cache is not None or args.fast_forward:
+            parser.error("--stats cannot be combined with --visualize, --stream, --jobs, --prefix-cache or --fast-forward")
+    if args.engine == 'numpy':
+        if args.visualize or args.stream or args.jobs > 1:
+            parser.error("--engine numpy cannot be combined with --visualize, --stream or --jobs")
+        # Optional dependency, only needed for the batched engine
+        try:
+            import tetris_numpy
+        except ImportError:
+            parser.error("--engine numpy requires NumPy")
+    if args.latency_report is not None:
+        if args.engine == 'numpy':
+            parser.error("--latency-report cannot be combined with --engine numpy")
+        if args.visualize or args.stream or args.jobs > 1 or args.input is not None or args.prefix_cache is not None or args.fast_forward or args.trace_heights or args.stats is not None or args.checkpoint is not None or args.serve is not None:
+            parser.error("--latency-report cannot be combined with --visualize, --stream, --jobs, --input, --prefix-cache, --fast-forward, --trace-heights, --stats, --checkpoint or --serve")
+        if args.slow_lines < 0:
+            parser.error("--slow-lines must not be negative")
+    if args.resume and args.checkpoint is None:
+        parser.error("--resume requires --checkpoint")
+    if args.checkpoint is not None:
+        if args.engine != 'bitboard':
+            parser.error(f"--checkpoint requires the bitboard engine, not --engine {args.engine}")
+        if args.visualize or args.jobs > 1 or args.prefix_cache is not None or args.fast_forward or args.trace_heights or args.stats is not None or args.serve is not None:
+            parser.error("--checkpoint cannot be combined with --visualize, --jobs, --prefix-cache, --fast-forward, --trace-heights, --stats or --serve")
+        if args.checkpoint_every < 1 or args.checkpoint_seconds <= 0:
+            parser.error("--checkpoint-every and --checkpoint-seconds must be positive")
+    if args.serve is not None:
+        if args.engine == 'numpy' or args.visualize or args.stream or args.input is not None or args.prefix_cache is not None or args.fast_forward or args.trace_heights or args.stats is not None:
+            parser.error("--serve cannot be combined with --engine numpy, --visualize, --stream, --input, --prefix-cache, --fast-forward, --trace-heights or --stats")
+        if args.max_sessions < 1 or args.idle_timeout <= 0:
+            parser.error("--max-sessions and --idle-timeout must be positive")
+        import tetris_server
+        tetris_server.run_server(args.serve, engine=args.engine, jobs=args.jobs, max_sessions=args.max_sessions, idle_seconds=args.idle_timeout)
+        return
+
+    if args.visualize:
+        args.visualize = GridView(args.visualize_rows, args.visualize_every, args.visualize_ansi)
+    sink = open_sink(args.visualize)
+    try:
+        run(args, sink)
+    finally:
+        sink.close()
+
+def run(args, sink):
+    if args.trace_heights:
+        engine = TetrisEngine()
+        out = sys.stdout.buffer
+        games = read_games(sys.stdin.buffer) if args.stream else map(parse_line, sys.stdin.read().splitlines())
+        for pieces in games:
+            trace_heights(pieces, engine, out)
+            # Skip whatever is left of the line after a rejected piece
+            for _ in pieces:
+                pass
+        out.flush()
+        return
+
+    if args.stats is not None:
+        # Instrumented copies of the engines, kept out of the hot path
+        import tetris_stats
+        stats = tetris_stats.Stats(timers=args.stats == 'timers')
+        for line in sys.stdin.read().splitlines():
+            try:
+                sink.write(tetris_stats.simulate_line(line, stats, engine=args.engine))
+            except Exception as e:
+                sink.write(-1)
+        stats.write(sys.stderr)
+        return
+
+    if args.latency_report is not None:
+        # Per-line timing, kept out of the default loop
+        import tetris_latency
+        tetris_latency.run_lines(sys.stdin.read().splitlines(), args.engine, sink, args.latency_report,
+                                 slow_lines=args.slow_lines, report=sys.stderr)
+        return
+
+    if args.engine == 'numpy':
+        import tetris_numpy
+        for height in tetris_numpy.simulate_lines(sys.stdin.read().splitlines()):
+            sink.write(height)
+        return
+
+    if args.checkpoint is not None:
+        import tetris_checkpoint
+        if args.input is not None:
+            data = map_file(args.input)
+            offsets = load_line_index(args.input, data)
+
+            def open_games(start_line):
+                start_line += args.start_line
+                start = offsets[start_line] if start_line < len(offsets) else len(data)
+                return mapped_games(data, start, len(data))
+        else:
+            def open_games(start_line):
+                games = read_games(sys.stdin.buffer)
+                for pieces in islice(games, start_line):
+                    for _ in pieces:
+                        pass
+                return games
+        tetris_checkpoint.run_games(open_games, sink, args.checkpoint, resume=args.resume,
+                                    every_pieces=args.checkpoint_every, every_seconds=args.checkpoint_seconds)
+        return
+
+    if args.input is not None:
+        data = map_file(args.input)
+        offsets = load_line_index(args.input, data)
+        if args.jobs > 1:
+            process_mapped_parallel(args.input, line_ranges(offsets, len(data), args.start_line), args.jobs, engine=args.engine, sink=sink, width=args.width)
+        else:
+            start = offsets[args.start_line] if args.start_line < len(offsets) else len(data)
+            process_games(mapped_games(data, start, len(data)), visualize=args.visualize, engine=args.engine, sink=sink, width=args.width)
+        return
+
+    if args.jobs > 1:
+        process_lines_parallel(sys.stdin.read().splitlines(), args.jobs, engine=args.engine, sink=sink, width=args.width)
+        return
+
+    if args.prefix_cache is not None:
+        cache = PrefixCache(args.prefix_cache << 20)
+        for line in sys.stdin.read().splitlines():
+            try:
+                sink.write(simulate_cached(line, cache))
+            except Exception as e:
+                sink.write(-1)
+        return
+
+    if args.fast_forward:
+        for line in sys.stdin.read().splitlines():
+            try:
+                sink.write(simulate_periodic(line))
+            except Exception as e:
+                sink.write(-1)
+        return
+
+    if args.stream:
+        process_games(read_games(sys.stdin.buffer), visualize=args.visualize, engine=args.engine, sink=sink, width=args.width)
+        return
+
+    process_stdin(sink, visualize=args.visualize, engine=args.engine, width=args.width)
+
+def process_stdin(sink, visualize=False, engine='dict', width=10):
+    # The default loop: one height per line of stdin
+    lines = sys.stdin.read().splitlines()
+    for line in lines:
+        try:
+            process_line(line, visualize=visualize, engine=engine, sink=sink, width=width)
+        except Exception as e:
+            sink.write(-1)
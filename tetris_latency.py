@@ -0,0 +1,130 @@
+import json
+import heapq
+from array import array
+from collections import Counter
+from operator import sub
+from time import perf_counter_ns
+
+from tetris_core import parse_line, simulate
+
+# Per-line latency recording behind --latency-report. While the lines are
+# solved, the loop appends one clock reading per line and the number of
+# pieces handed to the engine to arrays; once input ends, the times (from one
+# reading to the next, so a line's time includes writing its height) and the
+# piece counts go into log-bucketed histograms in the
+# style of HDR histograms: values below 2^(SUB_BUCKET_BITS + 1) get a bucket
+# each, larger values share 2^SUB_BUCKET_BITS buckets per power of two, so
+# any value is known to within 1 / 2^SUB_BUCKET_BITS of itself and the
+# buckets of a whole run fit in a fixed list. The K slowest lines are written to a side file,
+# with their rows cleared (found by replaying just those lines through the
+# instrumented engine) and their text for replay. Per line, the loop pays for
+# one clock read, a list of the line's pieces and two array appends.
+
+SUB_BUCKET_BITS = 7  # Under 1% relative error
+BUCKETS = 64 << SUB_BUCKET_BITS
+SLOW_LINES = 10
+PERCENTILES = (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('p99.9', 0.999))
+
+def bucket_index(value):
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return value
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+def bucket_high(index):
+    # Highest value that lands in bucket index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    if shift <= 0:
+        return index
+    top = index - (shift << SUB_BUCKET_BITS)
+    return ((top + 1) << shift) - 1
+
+class Histogram:
+    __slots__ = ('counts', 'total', 'sum', 'max')
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    def record(self, value, count=1):
+        self.counts[bucket_index(value)] += count
+        self.total += count
+        self.sum += value * count
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding the requested rank
+        rank = max(int(self.total * fraction + 0.5), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bucket_high(index), self.max)
+        return self.max
+
+    def summary(self):
+        summary = {'count': self.total, 'mean': self.sum / self.total if self.total else 0, 'max': self.max}
+        for name, fraction in PERCENTILES:
+            summary[name] = self.percentile(fraction) if self.total else 0
+        return summary
+
+    def buckets(self):
+        # (bucket upper bound, count) of every non-empty bucket
+        return [(bucket_high(index), count) for index, count in enumerate(self.counts) if count]
+
+def rows_cleared(line):
+    # Replay one line through the instrumented bitboard engine
+    import tetris_stats
+    stats = tetris_stats.Stats()
+    try:
+        tetris_stats.simulate_line(line, stats, engine='bitboard')
+    except Exception:
+        return -1
+    return stats.rows_cleared
+
+def run_lines(lines, engine, sink, slow_path, slow_lines=SLOW_LINES, report=None):
+    # Solve lines like the default loop of tetris.py, timing each one
+    stamps = array('Q')
+    piece_counts = array('Q')
+    mark = stamps.append
+    count = piece_counts.append
+    clock = perf_counter_ns
+    write = sink.write
+    mark(clock())
+    for line in lines:
+        pieces = list(parse_line(line))
+        try:
+            height = simulate(pieces, engine=engine)
+        except Exception:
+            height = -1
+        write(height)
+        count(len(pieces))
+        mark(clock())
+    times = array('Q', map(sub, stamps[1:], stamps))
+
+    latency = Histogram()
+    for value, number in Counter(times).items():
+        latency.record(value, number)
+    pieces = Histogram()
+    for value, number in Counter(piece_counts).items():
+        pieces.record(value, number)
+    slowest = heapq.nlargest(slow_lines, range(len(times)), key=times.__getitem__)
+
+    with open(slow_path, 'w') as f:
+        f.write("# index\tpieces\trows_cleared\ttime_ns\tline\n")
+        for index in slowest:
+            line = lines[index].strip()
+            f.write(f"{index}\t{piece_counts[index]}\t{rows_cleared(line)}\t{times[index]}\t{line}\n")
+
+    if report is not None:
+        json.dump({
+            'lines': latency.total,
+            'time_ns': latency.summary(),
+            'pieces': pieces.summary(),
+            'time_ns_buckets': latency.buckets(),
+            'slow_lines': slow_path,
+        }, report, indent=2)
+        report.write('\n')
@@ -0,0 +1,169 @@
+import sys
+from itertools import chain
+
+import numpy as np
+
+from tetris_core import PLACEMENTS, FULL_ROW
+
+# Vectorized batch engine: a batch of games is loaded as padded
+# (games x pieces) arrays of shape ids and columns, and every game advances
+# one piece per step with masked NumPy operations. Board rows are bitmasks,
+# as in the bitboard engine, so results match the scalar engines exactly.
+
+# Shape ids used in the piece arrays. UNKNOWN has no valid placement and
+# stands in for any token the scalar engines would reject.
+SHAPE_IDS = {shape_letter: shape_id for shape_id, shape_letter in enumerate(PLACEMENTS)}
+UNKNOWN = len(SHAPE_IDS)
+MAX_PIECE_ROWS = max(len(row_masks) for by_col in PLACEMENTS.values() for _, _, row_masks, _ in by_col.values())
+NO_CELL = 1 << 40  # Bottom offset of columns a piece does not touch
+
+# Games are grouped so that games x pieces stays under this many cells
+BATCH_CELLS = 1 << 22
+
+def build_tables():
+    # Dense versions of PLACEMENTS indexed by [shape_id, left_col(, col)]
+    valid = np.zeros((UNKNOWN + 1, 10), dtype=bool)
+    bottoms = np.full((UNKNOWN + 1, 10, 10), NO_CELL, dtype=np.int64)
+    tops = np.full((UNKNOWN + 1, 10, 10), -1, dtype=np.int64)
+    masks = np.zeros((UNKNOWN + 1, 10, MAX_PIECE_ROWS), dtype=np.uint16)
+    for shape_letter, by_col in PLACEMENTS.items():
+        shape_id = SHAPE_IDS[shape_letter]
+        for left_col, (skirt, piece_tops, row_masks, _) in by_col.items():
+            valid[shape_id, left_col] = True
+            for col, bottom in skirt:
+                bottoms[shape_id, left_col, col] = bottom
+            for col, top in piece_tops:
+                tops[shape_id, left_col, col] = top
+            masks[shape_id, left_col, :len(row_masks)] = row_masks
+    return valid, bottoms, tops, masks
+
+VALID, BOTTOMS, TOPS, MASKS = build_tables()
+
+# A game with any bad token scores -1 no matter where the token is, so it is
+# encoded as a single rejected piece
+FAILED_GAME = ([UNKNOWN], [0])
+
+def encode_line(line):
+    # Shape ids and columns of one line, mirroring parse_line
+    tokens = [piece_entry for piece_entry in line.strip().split(',') if piece_entry]
+    if not tokens:
+        return [], []
+    try:
+        cols = [int(piece_entry[1:]) for piece_entry in tokens]
+    except ValueError:
+        return FAILED_GAME
+    shape_ids = [SHAPE_IDS.get(piece_entry[0], UNKNOWN) for piece_entry in tokens]
+    if UNKNOWN in shape_ids or min(cols) < 0 or max(cols) > 9:
+        return FAILED_GAME
+    return shape_ids, cols
+
+def encode_games(games):
+    # Pad a list of encoded games into (games x pieces) arrays
+    lengths = np.array([len(shape_ids) for shape_ids, _ in games], dtype=np.int64)
+    width = int(lengths.max()) if len(games) else 0
+    shapes = np.full((len(games), width), UNKNOWN, dtype=np.int64)
+    cols = np.zeros((len(games), width), dtype=np.int64)
+    total = int(lengths.sum())
+    if total:
+        game_index = np.repeat(np.arange(len(games)), lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        piece_index = np.arange(total) - starts
+        shapes[game_index, piece_index] = np.fromiter(chain.from_iterable(shape_ids for shape_ids, _ in games), dtype=np.int64, count=total)
+        cols[game_index, piece_index] = np.fromiter(chain.from_iterable(game_cols for _, game_cols in games), dtype=np.int64, count=total)
+    return shapes, cols, lengths
+
+def clear_full_rows(board, heights, games, landing, full):
+    # Remove the full rows of the given games and shift the rows above down.
+    # full[i, r] says whether row landing[i] + r of games[i] is full.
+    sub = board[games]
+    count, capacity = sub.shape
+    removed = np.zeros((count, capacity), dtype=bool)
+    index = np.arange(count)
+    for row_offset in range(MAX_PIECE_ROWS):
+        sel = full[:, row_offset]
+        removed[index[sel], landing[sel] + row_offset] = True
+    # Each kept row moves down by the number of removed rows below it
+    dest = np.arange(capacity) - np.cumsum(removed, axis=1)
+    game_rows, kept_rows = np.nonzero(~removed)
+    cleared = np.zeros_like(sub)
+    cleared[game_rows, dest[game_rows, kept_rows]] = sub[game_rows, kept_rows]
+    board[games] = cleared
+    # Recompute the heights of the affected games: highest occupied row + 1
+    for col in range(10):
+        occupied = (cleared & (1 << col)) != 0
+        top = capacity - np.argmax(occupied[:, ::-1], axis=1)
+        heights[games, col] = np.where(occupied.any(axis=1), top, 0)
+
+def simulate_games(shapes, cols, lengths):
+    # Returns the final height of every game, or -1 where a piece was rejected
+    count, steps = shapes.shape
+    heights = np.zeros((count, 10), dtype=np.int64)
+    board = np.zeros((count, 64), dtype=np.uint16)
+    failed = np.zeros(count, dtype=bool)
+
+    for step in range(steps):
+        games = np.flatnonzero((step < lengths) & ~failed)
+        if not games.size:
+            break
+        shape_ids = shapes[games, step]
+        left_cols = cols[games, step]
+        ok = VALID[shape_ids, left_cols]
+        if not ok.all():
+            failed[games[~ok]] = True
+            games, shape_ids, left_cols = games[ok], shape_ids[ok], left_cols[ok]
+            if not games.size:
+                continue
+
+        # The piece rests on the highest column under its bottom skirt
+        landing = (heights[games] - BOTTOMS[shape_ids, left_cols]).max(axis=1)
+        needed = int(landing.max()) + MAX_PIECE_ROWS
+        if needed > board.shape[1]:
+            grown = max(needed, 2 * board.shape[1])
+            board = np.concatenate([board, np.zeros((count, grown - board.shape[1]), dtype=np.uint16)], axis=1)
+
+        masks = MASKS[shape_ids, left_cols]
+        full = np.zeros((games.size, MAX_PIECE_ROWS), dtype=bool)
+        collision = np.zeros(games.size, dtype=bool)
+        for row_offset in range(MAX_PIECE_ROWS):
+            rows = landing + row_offset
+            current = board[games, rows]
+            collision |= (current & masks[:, row_offset]) != 0
+            current |= masks[:, row_offset]
+            board[games, rows] = current
+            full[:, row_offset] = current == FULL_ROW
+        if collision.any():
+            failed[games[collision]] = True
+
+        tops = TOPS[shape_ids, left_cols]
+        heights[games] = np.where(tops >= 0, landing[:, None] + tops + 1, heights[games])
+
+        clearing = full.any(axis=1) & ~collision
+        if clearing.any():
+            clear_full_rows(board, heights, games[clearing], landing[clearing], full[clearing])
+
+    return np.where(failed, -1, heights.max(axis=1))
+
+def simulate_lines(lines, batch_cells=BATCH_CELLS):
+    # Final heights for a list of input lines, in input order. Games are
+    # sorted by length so each lockstep batch carries little padding.
+    games = [encode_line(line) for line in lines]
+    order = sorted(range(len(games)), key=lambda i: len(games[i][0]))
+    results = [0] * len(games)
+    start = 0
+    while start < len(order):
+        end = start + 1
+        while end < len(order) and (end - start + 1) * max(len(games[order[end]][0]), 1) <= batch_cells:
+            end += 1
+        batch = order[start:end]
+        heights = simulate_games(*encode_games([games[i] for i in batch]))
+        for i, height in zip(batch, heights.tolist()):
+            results[i] = height
+        start = end
+    return results
+
+def main():
+    for height in simulate_lines(sys.stdin.read().splitlines()):
+        print(height)
+
+if __name__ == "__main__":
+    main()
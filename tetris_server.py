@@ -0,0 +1,174 @@
+import sys
+import asyncio
+from itertools import count
+from concurrent.futures import ProcessPoolExecutor
+from time import monotonic
+
+from tetris_core import TetrisEngine, parse_line, simulate
+
+# Socket server behind --serve. Each request is one line and gets one line
+# back, in order per connection:
+#
+#   Q0,I4,...            final height of a fresh game (or -1)
+#   :new                 open a session; replies with its id
+#   :append ID PIECES    drop more pieces on the session's board; new height
+#   :height ID           current height of the session's board
+#   :reset ID            empty the session's board
+#   :close ID            drop the session
+#
+# A rejected piece ends a session's game: it answers -1 until :reset. Lines
+# of SERVE_HEAVY_CHARS or more run in a process pool, at most two per worker
+# at a time, so a huge line never stalls the event loop. Connections are
+# served one request at a time and every reply is drained before the next
+# line is read, so a client that stops reading stops being read from.
+
+SERVE_HEAVY_CHARS = 1 << 16
+SERVE_MAX_LINE = 1 << 27          # Longest request line accepted
+SERVE_MAX_SESSIONS = 1024
+SERVE_IDLE_SECONDS = 300.0        # Sessions unused this long are evicted
+
+def solve_line(line, engine='dict'):
+    try:
+        return simulate(parse_line(line), engine=engine)
+    except Exception:
+        return -1
+
+def append_line(state, line):
+    # Worker entry point for heavy appends: the board travels as a snapshot
+    engine = TetrisEngine()
+    engine.restore(state)
+    try:
+        height = engine.run(parse_line(line))
+    except ValueError:
+        height = -1
+    return height, engine.snapshot()
+
+class Session:
+    __slots__ = ('engine', 'failed', 'last_used', 'lock')
+
+    def __init__(self):
+        self.engine = TetrisEngine()
+        self.failed = False
+        self.last_used = monotonic()
+        self.lock = asyncio.Lock()
+
+    def height(self):
+        return -1 if self.failed else self.engine.height()
+
+class TetrisServer:
+    def __init__(self, engine='dict', jobs=1, max_sessions=SERVE_MAX_SESSIONS, idle_seconds=SERVE_IDLE_SECONDS):
+        self.engine = engine
+        self.pool = ProcessPoolExecutor(jobs)
+        self.slots = asyncio.Semaphore(2 * jobs)
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.sessions = {}
+        self.session_ids = count(1)
+
+    async def offload(self, function, *args):
+        async with self.slots:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, function, *args)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b'error: line too long\n')
+                    break
+                if not line:
+                    break
+                reply = await self.respond(line.decode('ascii', 'replace').strip())
+                writer.write(reply.encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, line):
+        if line.startswith(':'):
+            return await self.command(line[1:].split(None, 2))
+        if len(line) >= SERVE_HEAVY_CHARS:
+            return str(await self.offload(solve_line, line, self.engine))
+        return str(solve_line(line, self.engine))
+
+    async def command(self, words):
+        name = words[0] if words else ''
+        if name == 'new':
+            if len(self.sessions) >= self.max_sessions:
+                self.evict_idle()
+            if len(self.sessions) >= self.max_sessions:
+                return 'error: too many sessions'
+            session_id = str(next(self.session_ids))
+            self.sessions[session_id] = Session()
+            return session_id
+
+        if name not in ('append', 'height', 'reset', 'close'):
+            return f'error: unknown command {name}'
+        session = self.sessions.get(words[1]) if len(words) > 1 else None
+        if session is None:
+            return 'error: unknown session'
+        session.last_used = monotonic()
+        if name == 'append':
+            async with session.lock:
+                return str(await self.append(session, words[2] if len(words) > 2 else ''))
+        if name == 'height':
+            return str(session.height())
+        if name == 'reset':
+            async with session.lock:
+                session.engine.reset()
+                session.failed = False
+            return '0'
+        del self.sessions[words[1]]
+        return 'ok'
+
+    async def append(self, session, line):
+        if session.failed:
+            return -1
+        engine = session.engine
+        if len(line) >= SERVE_HEAVY_CHARS:
+            height, state = await self.offload(append_line, engine.snapshot(), line)
+            engine.restore(state)
+        else:
+            try:
+                height = engine.run(parse_line(line))
+            except ValueError:
+                height = -1
+        session.failed = height < 0
+        return height
+
+    def evict_idle(self):
+        cutoff = monotonic() - self.idle_seconds
+        for session_id, session in list(self.sessions.items()):
+            if session.last_used < cutoff and not session.lock.locked():
+                del self.sessions[session_id]
+
+    async def evict_periodically(self):
+        while True:
+            await asyncio.sleep(max(self.idle_seconds / 4, 1.0))
+            self.evict_idle()
+
+async def serve(address, **options):
+    # address is HOST:PORT, :PORT (localhost) or unix:PATH
+    server = TetrisServer(**options)
+    if address.startswith('unix:'):
+        listener = await asyncio.start_unix_server(server.handle, address[len('unix:'):], limit=SERVE_MAX_LINE)
+    else:
+        host, _, port = address.rpartition(':')
+        listener = await asyncio.start_server(server.handle, host or '127.0.0.1', int(port), limit=SERVE_MAX_LINE)
+    print(f"Serving on {address}", file=sys.stderr)
+    evictor = asyncio.create_task(server.evict_periodically())
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        evictor.cancel()
+        server.pool.shutdown(cancel_futures=True)
+
+def run_server(address, **options):
+    try:
+        asyncio.run(serve(address, **options))
+    except KeyboardInterrupt:
+        pass
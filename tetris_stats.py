@@ -0,0 +1,222 @@
+import json
+from array import array
+from time import perf_counter_ns
+
+from tetris_core import (
+    PLACEMENTS, PLACED, COLLISION, COMPACT_MIN_ROWS,
+    RowIndex, placement_status, landing_rows, collides, place_piece, check_full_rows, clear_rows,
+    compact_sealed_rows, restore_sealed_rows,
+    bitboard_landing_row, bitboard_collides, bitboard_place_piece, bitboard_clear_rows,
+    bitboard_compact_sealed_rows, bitboard_restore_sealed_rows, parse_line,
+)
+
+# Instrumented engines behind --stats. The hot paths in tetris_core.py carry
+# no instrumentation at all; the drops here call the same phase helpers as
+# drop_piece and bitboard_drop_piece, adding counters and optional timers
+# around each, and the simulate loops follow tetris_core's with counters.
+# tests/stats_check.py plays random games through both to catch drift.
+
+PHASES = ('parse', 'landing', 'collision', 'placement', 'full_row_check', 'clear_rows', 'compaction')
+PIECE_CELLS = 4  # Every shape covers four cells
+
+def no_clock():
+    return 0
+
+class Stats:
+    __slots__ = ('timers', 'clock', 'started', 'time_ns', 'lines', 'pieces', 'rejected',
+                 'clears', 'rows_cleared', 'compactions', 'restores', 'peak_height', 'peak_live_cells')
+
+    def __init__(self, timers=False):
+        self.timers = timers
+        # With timers off every phase boundary reads a constant clock
+        self.clock = perf_counter_ns if timers else no_clock
+        self.started = perf_counter_ns()
+        self.time_ns = dict.fromkeys(PHASES, 0)
+        self.lines = 0
+        self.pieces = 0
+        self.rejected = 0
+        self.clears = 0
+        self.rows_cleared = 0
+        self.compactions = 0
+        self.restores = 0
+        self.peak_height = 0
+        self.peak_live_cells = 0
+
+    def observe(self, height, live_cells):
+        if height > self.peak_height:
+            self.peak_height = height
+        if live_cells > self.peak_live_cells:
+            self.peak_live_cells = live_cells
+
+    def report(self):
+        report = {
+            'lines': self.lines,
+            'pieces': self.pieces,
+            'rejected': self.rejected,
+            'clears': self.clears,
+            'rows_cleared': self.rows_cleared,
+            'compactions': self.compactions,
+            'restores': self.restores,
+            'peak_height': self.peak_height,
+            'peak_live_cells': self.peak_live_cells,
+            'wall_ns': perf_counter_ns() - self.started,
+        }
+        if self.timers:
+            report['time_ns'] = dict(self.time_ns)
+        return report
+
+    def write(self, stream):
+        json.dump(self.report(), stream, indent=2)
+        stream.write('\n')
+
+def drop_piece(stats, column_blocks, column_heights, shape_letter, left_col, row_counts, row_index, column_rows):
+    # tetris_core.drop_piece with phase timers
+    clock = stats.clock
+    time_ns = stats.time_ns
+    start = clock()
+    placement = PLACEMENTS.get(shape_letter, {}).get(left_col)
+    if placement is None:
+        return placement_status(shape_letter)
+    skirt, tops, _, row_cols = placement
+    rows, physical_rows = landing_rows(column_heights, row_index, skirt, row_cols)
+    now = clock()
+    time_ns['landing'] += now - start
+    start = now
+
+    if collides(column_blocks, physical_rows, row_cols):
+        return COLLISION
+    now = clock()
+    time_ns['collision'] += now - start
+    start = now
+
+    place_piece(column_blocks, column_heights, row_counts, column_rows, shape_letter, rows, physical_rows, row_cols, tops)
+    now = clock()
+    time_ns['placement'] += now - start
+    start = now
+
+    full_rows = check_full_rows(row_counts, rows, physical_rows)
+    now = clock()
+    time_ns['full_row_check'] += now - start
+    if full_rows:
+        clear_rows(column_blocks, column_heights, row_counts, row_index, column_rows, full_rows)
+        time_ns['clear_rows'] += clock() - now
+        stats.clears += 1
+        stats.rows_cleared += len(full_rows)
+    return PLACED
+
+def bitboard_drop_piece(stats, rows, column_heights, shape_letter, left_col):
+    # tetris_core.bitboard_drop_piece with phase timers. Placement finds the
+    # full rows in the same pass, so they are timed as part of it; the
+    # collision test is run on its own first so it can be timed.
+    clock = stats.clock
+    time_ns = stats.time_ns
+    start = clock()
+    placement = PLACEMENTS.get(shape_letter, {}).get(left_col)
+    if placement is None:
+        return placement_status(shape_letter)
+    skirt, tops, row_masks, _ = placement
+    landing_row = bitboard_landing_row(rows, column_heights, skirt, row_masks)
+    now = clock()
+    time_ns['landing'] += now - start
+    start = now
+
+    if bitboard_collides(rows, landing_row, row_masks):
+        return COLLISION
+    now = clock()
+    time_ns['collision'] += now - start
+    start = now
+
+    full_rows = bitboard_place_piece(rows, column_heights, landing_row, row_masks, tops)
+    now = clock()
+    time_ns['placement'] += now - start
+    if full_rows:
+        bitboard_clear_rows(rows, column_heights, full_rows)
+        time_ns['clear_rows'] += clock() - now
+        stats.clears += 1
+        stats.rows_cleared += len(full_rows)
+    return PLACED
+
+def simulate_dict(pieces, stats):
+    # tetris.simulate (dict engine) with counters
+    column_blocks = [{} for _ in range(10)]
+    column_heights = [0] * 10
+    row_counts = {}
+    row_index = RowIndex()
+    column_rows = [[] for _ in range(10)]
+    base_row = 0
+    sealed = []
+    compact_at = COMPACT_MIN_ROWS
+    live_cells = 0
+    clock = stats.clock
+
+    for shape_letter, left_col in pieces:
+        rows_cleared = stats.rows_cleared
+        status = drop_piece(stats, column_blocks, column_heights, shape_letter, left_col, row_counts, row_index, column_rows)
+        if status:
+            stats.rejected += 1
+            return -1
+        stats.pieces += 1
+        live_cells += PIECE_CELLS - 10 * (stats.rows_cleared - rows_cleared)
+        stats.observe(base_row + row_index.count, live_cells)
+
+        start = clock()
+        if sealed and 0 in column_heights:
+            base_row -= restore_sealed_rows(column_blocks, column_heights, row_counts, row_index, column_rows, sealed)
+            live_cells = sum(row_counts.values())
+            stats.restores += 1
+        if row_index.count >= compact_at:
+            folded = compact_sealed_rows(column_blocks, column_heights, row_counts, row_index, column_rows, sealed)
+            base_row += folded
+            compact_at = max(2 * row_index.count, COMPACT_MIN_ROWS)
+            if folded:
+                live_cells = sum(row_counts.values())
+                stats.compactions += 1
+        stats.time_ns['compaction'] += clock() - start
+
+    return base_row + row_index.count
+
+def simulate_bitboard(pieces, stats):
+    # tetris.run_bitboard on an empty board, with counters
+    rows = array('H')
+    column_heights = [0] * 10
+    base_row = 0
+    sealed = []
+    compact_at = COMPACT_MIN_ROWS
+    live_cells = 0
+    clock = stats.clock
+
+    for shape_letter, left_col in pieces:
+        rows_cleared = stats.rows_cleared
+        status = bitboard_drop_piece(stats, rows, column_heights, shape_letter, left_col)
+        if status:
+            stats.rejected += 1
+            return -1
+        stats.pieces += 1
+        live_cells += PIECE_CELLS - 10 * (stats.rows_cleared - rows_cleared)
+        stats.observe(base_row + len(rows), live_cells)
+
+        start = clock()
+        if sealed and 0 in column_heights:
+            base_row -= bitboard_restore_sealed_rows(rows, column_heights, sealed)
+            live_cells = sum(bin(row).count('1') for row in rows)
+            stats.restores += 1
+        if len(rows) >= compact_at:
+            folded = bitboard_compact_sealed_rows(rows, column_heights, sealed)
+            base_row += folded
+            compact_at = max(2 * len(rows), COMPACT_MIN_ROWS)
+            if folded:
+                live_cells = sum(bin(row).count('1') for row in rows)
+                stats.compactions += 1
+        stats.time_ns['compaction'] += clock() - start
+
+    return base_row + len(rows)
+
+def simulate_line(line, stats, engine='dict'):
+    # Final height of one input line, or -1, recording stats along the way
+    stats.lines += 1
+    start = stats.clock()
+    pieces = [(shape_letter, int(column)) for shape_letter, column in parse_line(line)]
+    stats.time_ns['parse'] += stats.clock() - start
+    if engine == 'bitboard':
+        return simulate_bitboard(pieces, stats)
+    return simulate_dict(pieces, stats)
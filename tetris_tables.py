@@ -0,0 +1,220 @@
+# Generated by `python tetris.py --write-tables` from tetris_core.SHAPES; do not edit.
+# tetris_core.py loads these tables instead of building them at startup.
+
+LAYOUT = 1
+
+SHAPES = {
+    'Q': [(0, 0), (0, 1), (1, 0), (1, 1)],
+    'Z': [(1, 0), (1, 1), (0, 1), (0, 2)],
+    'S': [(1, 1), (1, 2), (0, 0), (0, 1)],
+    'T': [(1, 0), (1, 1), (1, 2), (0, 1)],
+    'I': [(0, 0), (0, 1), (0, 2), (0, 3)],
+    'L': [(0, 0), (1, 0), (2, 0), (0, 1)],
+    'J': [(0, 1), (1, 1), (2, 1), (0, 0)],
+}
+
+PLACEMENTS = {
+    'Q': {
+        0: (((0, 0), (1, 0)), ((0, 1), (1, 1)), (3, 3), ((0, 1), (0, 1))),
+        1: (((1, 0), (2, 0)), ((1, 1), (2, 1)), (6, 6), ((1, 2), (1, 2))),
+        2: (((2, 0), (3, 0)), ((2, 1), (3, 1)), (12, 12), ((2, 3), (2, 3))),
+        3: (((3, 0), (4, 0)), ((3, 1), (4, 1)), (24, 24), ((3, 4), (3, 4))),
+        4: (((4, 0), (5, 0)), ((4, 1), (5, 1)), (48, 48), ((4, 5), (4, 5))),
+        5: (((5, 0), (6, 0)), ((5, 1), (6, 1)), (96, 96), ((5, 6), (5, 6))),
+        6: (((6, 0), (7, 0)), ((6, 1), (7, 1)), (192, 192), ((6, 7), (6, 7))),
+        7: (((7, 0), (8, 0)), ((7, 1), (8, 1)), (384, 384), ((7, 8), (7, 8))),
+        8: (((8, 0), (9, 0)), ((8, 1), (9, 1)), (768, 768), ((8, 9), (8, 9))),
+    },
+    'Z': {
+        0: (((1, 0), (2, 0), (0, 1)), ((1, 1), (2, 0), (0, 1)), (6, 3), ((1, 2), (0, 1))),
+        1: (((2, 0), (3, 0), (1, 1)), ((2, 1), (3, 0), (1, 1)), (12, 6), ((2, 3), (1, 2))),
+        2: (((3, 0), (4, 0), (2, 1)), ((3, 1), (4, 0), (2, 1)), (24, 12), ((3, 4), (2, 3))),
+        3: (((4, 0), (5, 0), (3, 1)), ((4, 1), (5, 0), (3, 1)), (48, 24), ((4, 5), (3, 4))),
+        4: (((5, 0), (6, 0), (4, 1)), ((5, 1), (6, 0), (4, 1)), (96, 48), ((5, 6), (4, 5))),
+        5: (((6, 0), (7, 0), (5, 1)), ((6, 1), (7, 0), (5, 1)), (192, 96), ((6, 7), (5, 6))),
+        6: (((7, 0), (8, 0), (6, 1)), ((7, 1), (8, 0), (6, 1)), (384, 192), ((7, 8), (6, 7))),
+        7: (((8, 0), (9, 0), (7, 1)), ((8, 1), (9, 0), (7, 1)), (768, 384), ((8, 9), (7, 8))),
+    },
+    'S': {
+        0: (((0, 0), (1, 0), (2, 1)), ((0, 0), (1, 1), (2, 1)), (3, 6), ((0, 1), (1, 2))),
+        1: (((1, 0), (2, 0), (3, 1)), ((1, 0), (2, 1), (3, 1)), (6, 12), ((1, 2), (2, 3))),
+        2: (((2, 0), (3, 0), (4, 1)), ((2, 0), (3, 1), (4, 1)), (12, 24), ((2, 3), (3, 4))),
+        3: (((3, 0), (4, 0), (5, 1)), ((3, 0), (4, 1), (5, 1)), (24, 48), ((3, 4), (4, 5))),
+        4: (((4, 0), (5, 0), (6, 1)), ((4, 0), (5, 1), (6, 1)), (48, 96), ((4, 5), (5, 6))),
+        5: (((5, 0), (6, 0), (7, 1)), ((5, 0), (6, 1), (7, 1)), (96, 192), ((5, 6), (6, 7))),
+        6: (((6, 0), (7, 0), (8, 1)), ((6, 0), (7, 1), (8, 1)), (192, 384), ((6, 7), (7, 8))),
+        7: (((7, 0), (8, 0), (9, 1)), ((7, 0), (8, 1), (9, 1)), (384, 768), ((7, 8), (8, 9))),
+    },
+    'T': {
+        0: (((1, 0), (0, 1), (2, 1)), ((1, 1), (0, 1), (2, 1)), (2, 7), ((1,), (0, 1, 2))),
+        1: (((2, 0), (1, 1), (3, 1)), ((2, 1), (1, 1), (3, 1)), (4, 14), ((2,), (1, 2, 3))),
+        2: (((3, 0), (2, 1), (4, 1)), ((3, 1), (2, 1), (4, 1)), (8, 28), ((3,), (2, 3, 4))),
+        3: (((4, 0), (3, 1), (5, 1)), ((4, 1), (3, 1), (5, 1)), (16, 56), ((4,), (3, 4, 5))),
+        4: (((5, 0), (4, 1), (6, 1)), ((5, 1), (4, 1), (6, 1)), (32, 112), ((5,), (4, 5, 6))),
+        5: (((6, 0), (5, 1), (7, 1)), ((6, 1), (5, 1), (7, 1)), (64, 224), ((6,), (5, 6, 7))),
+        6: (((7, 0), (6, 1), (8, 1)), ((7, 1), (6, 1), (8, 1)), (128, 448), ((7,), (6, 7, 8))),
+        7: (((8, 0), (7, 1), (9, 1)), ((8, 1), (7, 1), (9, 1)), (256, 896), ((8,), (7, 8, 9))),
+    },
+    'I': {
+        0: (((0, 0), (1, 0), (2, 0), (3, 0)), ((0, 0), (1, 0), (2, 0), (3, 0)), (15,), ((0, 1, 2, 3),)),
+        1: (((1, 0), (2, 0), (3, 0), (4, 0)), ((1, 0), (2, 0), (3, 0), (4, 0)), (30,), ((1, 2, 3, 4),)),
+        2: (((2, 0), (3, 0), (4, 0), (5, 0)), ((2, 0), (3, 0), (4, 0), (5, 0)), (60,), ((2, 3, 4, 5),)),
+        3: (((3, 0), (4, 0), (5, 0), (6, 0)), ((3, 0), (4, 0), (5, 0), (6, 0)), (120,), ((3, 4, 5, 6),)),
+        4: (((4, 0), (5, 0), (6, 0), (7, 0)), ((4, 0), (5, 0), (6, 0), (7, 0)), (240,), ((4, 5, 6, 7),)),
+        5: (((5, 0), (6, 0), (7, 0), (8, 0)), ((5, 0), (6, 0), (7, 0), (8, 0)), (480,), ((5, 6, 7, 8),)),
+        6: (((6, 0), (7, 0), (8, 0), (9, 0)), ((6, 0), (7, 0), (8, 0), (9, 0)), (960,), ((6, 7, 8, 9),)),
+    },
+    'L': {
+        0: (((0, 0), (1, 0)), ((0, 2), (1, 0)), (3, 1, 1), ((0, 1), (0,), (0,))),
+        1: (((1, 0), (2, 0)), ((1, 2), (2, 0)), (6, 2, 2), ((1, 2), (1,), (1,))),
+        2: (((2, 0), (3, 0)), ((2, 2), (3, 0)), (12, 4, 4), ((2, 3), (2,), (2,))),
+        3: (((3, 0), (4, 0)), ((3, 2), (4, 0)), (24, 8, 8), ((3, 4), (3,), (3,))),
+        4: (((4, 0), (5, 0)), ((4, 2), (5, 0)), (48, 16, 16), ((4, 5), (4,), (4,))),
+        5: (((5, 0), (6, 0)), ((5, 2), (6, 0)), (96, 32, 32), ((5, 6), (5,), (5,))),
+        6: (((6, 0), (7, 0)), ((6, 2), (7, 0)), (192, 64, 64), ((6, 7), (6,), (6,))),
+        7: (((7, 0), (8, 0)), ((7, 2), (8, 0)), (384, 128, 128), ((7, 8), (7,), (7,))),
+        8: (((8, 0), (9, 0)), ((8, 2), (9, 0)), (768, 256, 256), ((8, 9), (8,), (8,))),
+    },
+    'J': {
+        0: (((0, 0), (1, 0)), ((0, 0), (1, 2)), (3, 2, 2), ((0, 1), (1,), (1,))),
+        1: (((1, 0), (2, 0)), ((1, 0), (2, 2)), (6, 4, 4), ((1, 2), (2,), (2,))),
+        2: (((2, 0), (3, 0)), ((2, 0), (3, 2)), (12, 8, 8), ((2, 3), (3,), (3,))),
+        3: (((3, 0), (4, 0)), ((3, 0), (4, 2)), (24, 16, 16), ((3, 4), (4,), (4,))),
+        4: (((4, 0), (5, 0)), ((4, 0), (5, 2)), (48, 32, 32), ((4, 5), (5,), (5,))),
+        5: (((5, 0), (6, 0)), ((5, 0), (6, 2)), (96, 64, 64), ((5, 6), (6,), (6,))),
+        6: (((6, 0), (7, 0)), ((6, 0), (7, 2)), (192, 128, 128), ((6, 7), (7,), (7,))),
+        7: (((7, 0), (8, 0)), ((7, 0), (8, 2)), (384, 256, 256), ((7, 8), (8,), (8,))),
+        8: (((8, 0), (9, 0)), ((8, 0), (9, 2)), (768, 512, 512), ((8, 9), (9,), (9,))),
+    },
+}
+
+MASK_TEXT = [
+    '..........', '#.........', '.#........', '##........', '..#.......', '#.#.......', '.##.......', '###.......',
+    '...#......', '#..#......', '.#.#......', '##.#......', '..##......', '#.##......', '.###......', '####......',
+    '....#.....', '#...#.....', '.#..#.....', '##..#.....', '..#.#.....', '#.#.#.....', '.##.#.....', '###.#.....',
+    '...##.....', '#..##.....', '.#.##.....', '##.##.....', '..###.....', '#.###.....', '.####.....', '#####.....',
+    '.....#....', '#....#....', '.#...#....', '##...#....', '..#..#....', '#.#..#....', '.##..#....', '###..#....',
+    '...#.#....', '#..#.#....', '.#.#.#....', '##.#.#....', '..##.#....', '#.##.#....', '.###.#....', '####.#....',
+    '....##....', '#...##....', '.#..##....', '##..##....', '..#.##....', '#.#.##....', '.##.##....', '###.##....',
+    '...###....', '#..###....', '.#.###....', '##.###....', '..####....', '#.####....', '.#####....', '######....',
+    '......#...', '#.....#...', '.#....#...', '##....#...', '..#...#...', '#.#...#...', '.##...#...', '###...#...',
+    '...#..#...', '#..#..#...', '.#.#..#...', '##.#..#...', '..##..#...', '#.##..#...', '.###..#...', '####..#...',
+    '....#.#...', '#...#.#...', '.#..#.#...', '##..#.#...', '..#.#.#...', '#.#.#.#...', '.##.#.#...', '###.#.#...',
+    '...##.#...', '#..##.#...', '.#.##.#...', '##.##.#...', '..###.#...', '#.###.#...', '.####.#...', '#####.#...',
+    '.....##...', '#....##...', '.#...##...', '##...##...', '..#..##...', '#.#..##...', '.##..##...', '###..##...',
+    '...#.##...', '#..#.##...', '.#.#.##...', '##.#.##...', '..##.##...', '#.##.##...', '.###.##...', '####.##...',
+    '....###...', '#...###...', '.#..###...', '##..###...', '..#.###...', '#.#.###...', '.##.###...', '###.###...',
+    '...####...', '#..####...', '.#.####...', '##.####...', '..#####...', '#.#####...', '.######...', '#######...',
+    '.......#..', '#......#..', '.#.....#..', '##.....#..', '..#....#..', '#.#....#..', '.##....#..', '###....#..',
+    '...#...#..', '#..#...#..', '.#.#...#..', '##.#...#..', '..##...#..', '#.##...#..', '.###...#..', '####...#..',
+    '....#..#..', '#...#..#..', '.#..#..#..', '##..#..#..', '..#.#..#..', '#.#.#..#..', '.##.#..#..', '###.#..#..',
+    '...##..#..', '#..##..#..', '.#.##..#..', '##.##..#..', '..###..#..', '#.###..#..', '.####..#..', '#####..#..',
+    '.....#.#..', '#....#.#..', '.#...#.#..', '##...#.#..', '..#..#.#..', '#.#..#.#..', '.##..#.#..', '###..#.#..',
+    '...#.#.#..', '#..#.#.#..', '.#.#.#.#..', '##.#.#.#..', '..##.#.#..', '#.##.#.#..', '.###.#.#..', '####.#.#..',
+    '....##.#..', '#...##.#..', '.#..##.#..', '##..##.#..', '..#.##.#..', '#.#.##.#..', '.##.##.#..', '###.##.#..',
+    '...###.#..', '#..###.#..', '.#.###.#..', '##.###.#..', '..####.#..', '#.####.#..', '.#####.#..', '######.#..',
+    '......##..', '#.....##..', '.#....##..', '##....##..', '..#...##..', '#.#...##..', '.##...##..', '###...##..',
+    '...#..##..', '#..#..##..', '.#.#..##..', '##.#..##..', '..##..##..', '#.##..##..', '.###..##..', '####..##..',
+    '....#.##..', '#...#.##..', '.#..#.##..', '##..#.##..', '..#.#.##..', '#.#.#.##..', '.##.#.##..', '###.#.##..',
+    '...##.##..', '#..##.##..', '.#.##.##..', '##.##.##..', '..###.##..', '#.###.##..', '.####.##..', '#####.##..',
+    '.....###..', '#....###..', '.#...###..', '##...###..', '..#..###..', '#.#..###..', '.##..###..', '###..###..',
+    '...#.###..', '#..#.###..', '.#.#.###..', '##.#.###..', '..##.###..', '#.##.###..', '.###.###..', '####.###..',
+    '....####..', '#...####..', '.#..####..', '##..####..', '..#.####..', '#.#.####..', '.##.####..', '###.####..',
+    '...#####..', '#..#####..', '.#.#####..', '##.#####..', '..######..', '#.######..', '.#######..', '########..',
+    '........#.', '#.......#.', '.#......#.', '##......#.', '..#.....#.', '#.#.....#.', '.##.....#.', '###.....#.',
+    '...#....#.', '#..#....#.', '.#.#....#.', '##.#....#.', '..##....#.', '#.##....#.', '.###....#.', '####....#.',
+    '....#...#.', '#...#...#.', '.#..#...#.', '##..#...#.', '..#.#...#.', '#.#.#...#.', '.##.#...#.', '###.#...#.',
+    '...##...#.', '#..##...#.', '.#.##...#.', '##.##...#.', '..###...#.', '#.###...#.', '.####...#.', '#####...#.',
+    '.....#..#.', '#....#..#.', '.#...#..#.', '##...#..#.', '..#..#..#.', '#.#..#..#.', '.##..#..#.', '###..#..#.',
+    '...#.#..#.', '#..#.#..#.', '.#.#.#..#.', '##.#.#..#.', '..##.#..#.', '#.##.#..#.', '.###.#..#.', '####.#..#.',
+    '....##..#.', '#...##..#.', '.#..##..#.', '##..##..#.', '..#.##..#.', '#.#.##..#.', '.##.##..#.', '###.##..#.',
+    '...###..#.', '#..###..#.', '.#.###..#.', '##.###..#.', '..####..#.', '#.####..#.', '.#####..#.', '######..#.',
+    '......#.#.', '#.....#.#.', '.#....#.#.', '##....#.#.', '..#...#.#.', '#.#...#.#.', '.##...#.#.', '###...#.#.',
+    '...#..#.#.', '#..#..#.#.', '.#.#..#.#.', '##.#..#.#.', '..##..#.#.', '#.##..#.#.', '.###..#.#.', '####..#.#.',
+    '....#.#.#.', '#...#.#.#.', '.#..#.#.#.', '##..#.#.#.', '..#.#.#.#.', '#.#.#.#.#.', '.##.#.#.#.', '###.#.#.#.',
+    '...##.#.#.', '#..##.#.#.', '.#.##.#.#.', '##.##.#.#.', '..###.#.#.', '#.###.#.#.', '.####.#.#.', '#####.#.#.',
+    '.....##.#.', '#....##.#.', '.#...##.#.', '##...##.#.', '..#..##.#.', '#.#..##.#.', '.##..##.#.', '###..##.#.',
+    '...#.##.#.', '#..#.##.#.', '.#.#.##.#.', '##.#.##.#.', '..##.##.#.', '#.##.##.#.', '.###.##.#.', '####.##.#.',
+    '....###.#.', '#...###.#.', '.#..###.#.', '##..###.#.', '..#.###.#.', '#.#.###.#.', '.##.###.#.', '###.###.#.',
+    '...####.#.', '#..####.#.', '.#.####.#.', '##.####.#.', '..#####.#.', '#.#####.#.', '.######.#.', '#######.#.',
+    '.......##.', '#......##.', '.#.....##.', '##.....##.', '..#....##.', '#.#....##.', '.##....##.', '###....##.',
+    '...#...##.', '#..#...##.', '.#.#...##.', '##.#...##.', '..##...##.', '#.##...##.', '.###...##.', '####...##.',
+    '....#..##.', '#...#..##.', '.#..#..##.', '##..#..##.', '..#.#..##.', '#.#.#..##.', '.##.#..##.', '###.#..##.',
+    '...##..##.', '#..##..##.', '.#.##..##.', '##.##..##.', '..###..##.', '#.###..##.', '.####..##.', '#####..##.',
+    '.....#.##.', '#....#.##.', '.#...#.##.', '##...#.##.', '..#..#.##.', '#.#..#.##.', '.##..#.##.', '###..#.##.',
+    '...#.#.##.', '#..#.#.##.', '.#.#.#.##.', '##.#.#.##.', '..##.#.##.', '#.##.#.##.', '.###.#.##.', '####.#.##.',
+    '....##.##.', '#...##.##.', '.#..##.##.', '##..##.##.', '..#.##.##.', '#.#.##.##.', '.##.##.##.', '###.##.##.',
+    '...###.##.', '#..###.##.', '.#.###.##.', '##.###.##.', '..####.##.', '#.####.##.', '.#####.##.', '######.##.',
+    '......###.', '#.....###.', '.#....###.', '##....###.', '..#...###.', '#.#...###.', '.##...###.', '###...###.',
+    '...#..###.', '#..#..###.', '.#.#..###.', '##.#..###.', '..##..###.', '#.##..###.', '.###..###.', '####..###.',
+    '....#.###.', '#...#.###.', '.#..#.###.', '##..#.###.', '..#.#.###.', '#.#.#.###.', '.##.#.###.', '###.#.###.',
+    '...##.###.', '#..##.###.', '.#.##.###.', '##.##.###.', '..###.###.', '#.###.###.', '.####.###.', '#####.###.',
+    '.....####.', '#....####.', '.#...####.', '##...####.', '..#..####.', '#.#..####.', '.##..####.', '###..####.',
+    '...#.####.', '#..#.####.', '.#.#.####.', '##.#.####.', '..##.####.', '#.##.####.', '.###.####.', '####.####.',
+    '....#####.', '#...#####.', '.#..#####.', '##..#####.', '..#.#####.', '#.#.#####.', '.##.#####.', '###.#####.',
+    '...######.', '#..######.', '.#.######.', '##.######.', '..#######.', '#.#######.', '.########.', '#########.',
+    '.........#', '#........#', '.#.......#', '##.......#', '..#......#', '#.#......#', '.##......#', '###......#',
+    '...#.....#', '#..#.....#', '.#.#.....#', '##.#.....#', '..##.....#', '#.##.....#', '.###.....#', '####.....#',
+    '....#....#', '#...#....#', '.#..#....#', '##..#....#', '..#.#....#', '#.#.#....#', '.##.#....#', '###.#....#',
+    '...##....#', '#..##....#', '.#.##....#', '##.##....#', '..###....#', '#.###....#', '.####....#', '#####....#',
+    '.....#...#', '#....#...#', '.#...#...#', '##...#...#', '..#..#...#', '#.#..#...#', '.##..#...#', '###..#...#',
+    '...#.#...#', '#..#.#...#', '.#.#.#...#', '##.#.#...#', '..##.#...#', '#.##.#...#', '.###.#...#', '####.#...#',
+    '....##...#', '#...##...#', '.#..##...#', '##..##...#', '..#.##...#', '#.#.##...#', '.##.##...#', '###.##...#',
+    '...###...#', '#..###...#', '.#.###...#', '##.###...#', '..####...#', '#.####...#', '.#####...#', '######...#',
+    '......#..#', '#.....#..#', '.#....#..#', '##....#..#', '..#...#..#', '#.#...#..#', '.##...#..#', '###...#..#',
+    '...#..#..#', '#..#..#..#', '.#.#..#..#', '##.#..#..#', '..##..#..#', '#.##..#..#', '.###..#..#', '####..#..#',
+    '....#.#..#', '#...#.#..#', '.#..#.#..#', '##..#.#..#', '..#.#.#..#', '#.#.#.#..#', '.##.#.#..#', '###.#.#..#',
+    '...##.#..#', '#..##.#..#', '.#.##.#..#', '##.##.#..#', '..###.#..#', '#.###.#..#', '.####.#..#', '#####.#..#',
+    '.....##..#', '#....##..#', '.#...##..#', '##...##..#', '..#..##..#', '#.#..##..#', '.##..##..#', '###..##..#',
+    '...#.##..#', '#..#.##..#', '.#.#.##..#', '##.#.##..#', '..##.##..#', '#.##.##..#', '.###.##..#', '####.##..#',
+    '....###..#', '#...###..#', '.#..###..#', '##..###..#', '..#.###..#', '#.#.###..#', '.##.###..#', '###.###..#',
+    '...####..#', '#..####..#', '.#.####..#', '##.####..#', '..#####..#', '#.#####..#', '.######..#', '#######..#',
+    '.......#.#', '#......#.#', '.#.....#.#', '##.....#.#', '..#....#.#', '#.#....#.#', '.##....#.#', '###....#.#',
+    '...#...#.#', '#..#...#.#', '.#.#...#.#', '##.#...#.#', '..##...#.#', '#.##...#.#', '.###...#.#', '####...#.#',
+    '....#..#.#', '#...#..#.#', '.#..#..#.#', '##..#..#.#', '..#.#..#.#', '#.#.#..#.#', '.##.#..#.#', '###.#..#.#',
+    '...##..#.#', '#..##..#.#', '.#.##..#.#', '##.##..#.#', '..###..#.#', '#.###..#.#', '.####..#.#', '#####..#.#',
+    '.....#.#.#', '#....#.#.#', '.#...#.#.#', '##...#.#.#', '..#..#.#.#', '#.#..#.#.#', '.##..#.#.#', '###..#.#.#',
+    '...#.#.#.#', '#..#.#.#.#', '.#.#.#.#.#', '##.#.#.#.#', '..##.#.#.#', '#.##.#.#.#', '.###.#.#.#', '####.#.#.#',
+    '....##.#.#', '#...##.#.#', '.#..##.#.#', '##..##.#.#', '..#.##.#.#', '#.#.##.#.#', '.##.##.#.#', '###.##.#.#',
+    '...###.#.#', '#..###.#.#', '.#.###.#.#', '##.###.#.#', '..####.#.#', '#.####.#.#', '.#####.#.#', '######.#.#',
+    '......##.#', '#.....##.#', '.#....##.#', '##....##.#', '..#...##.#', '#.#...##.#', '.##...##.#', '###...##.#',
+    '...#..##.#', '#..#..##.#', '.#.#..##.#', '##.#..##.#', '..##..##.#', '#.##..##.#', '.###..##.#', '####..##.#',
+    '....#.##.#', '#...#.##.#', '.#..#.##.#', '##..#.##.#', '..#.#.##.#', '#.#.#.##.#', '.##.#.##.#', '###.#.##.#',
+    '...##.##.#', '#..##.##.#', '.#.##.##.#', '##.##.##.#', '..###.##.#', '#.###.##.#', '.####.##.#', '#####.##.#',
+    '.....###.#', '#....###.#', '.#...###.#', '##...###.#', '..#..###.#', '#.#..###.#', '.##..###.#', '###..###.#',
+    '...#.###.#', '#..#.###.#', '.#.#.###.#', '##.#.###.#', '..##.###.#', '#.##.###.#', '.###.###.#', '####.###.#',
+    '....####.#', '#...####.#', '.#..####.#', '##..####.#', '..#.####.#', '#.#.####.#', '.##.####.#', '###.####.#',
+    '...#####.#', '#..#####.#', '.#.#####.#', '##.#####.#', '..######.#', '#.######.#', '.#######.#', '########.#',
+    '........##', '#.......##', '.#......##', '##......##', '..#.....##', '#.#.....##', '.##.....##', '###.....##',
+    '...#....##', '#..#....##', '.#.#....##', '##.#....##', '..##....##', '#.##....##', '.###....##', '####....##',
+    '....#...##', '#...#...##', '.#..#...##', '##..#...##', '..#.#...##', '#.#.#...##', '.##.#...##', '###.#...##',
+    '...##...##', '#..##...##', '.#.##...##', '##.##...##', '..###...##', '#.###...##', '.####...##', '#####...##',
+    '.....#..##', '#....#..##', '.#...#..##', '##...#..##', '..#..#..##', '#.#..#..##', '.##..#..##', '###..#..##',
+    '...#.#..##', '#..#.#..##', '.#.#.#..##', '##.#.#..##', '..##.#..##', '#.##.#..##', '.###.#..##', '####.#..##',
+    '....##..##', '#...##..##', '.#..##..##', '##..##..##', '..#.##..##', '#.#.##..##', '.##.##..##', '###.##..##',
+    '...###..##', '#..###..##', '.#.###..##', '##.###..##', '..####..##', '#.####..##', '.#####..##', '######..##',
+    '......#.##', '#.....#.##', '.#....#.##', '##....#.##', '..#...#.##', '#.#...#.##', '.##...#.##', '###...#.##',
+    '...#..#.##', '#..#..#.##', '.#.#..#.##', '##.#..#.##', '..##..#.##', '#.##..#.##', '.###..#.##', '####..#.##',
+    '....#.#.##', '#...#.#.##', '.#..#.#.##', '##..#.#.##', '..#.#.#.##', '#.#.#.#.##', '.##.#.#.##', '###.#.#.##',
+    '...##.#.##', '#..##.#.##', '.#.##.#.##', '##.##.#.##', '..###.#.##', '#.###.#.##', '.####.#.##', '#####.#.##',
+    '.....##.##', '#....##.##', '.#...##.##', '##...##.##', '..#..##.##', '#.#..##.##', '.##..##.##', '###..##.##',
+    '...#.##.##', '#..#.##.##', '.#.#.##.##', '##.#.##.##', '..##.##.##', '#.##.##.##', '.###.##.##', '####.##.##',
+    '....###.##', '#...###.##', '.#..###.##', '##..###.##', '..#.###.##', '#.#.###.##', '.##.###.##', '###.###.##',
+    '...####.##', '#..####.##', '.#.####.##', '##.####.##', '..#####.##', '#.#####.##', '.######.##', '#######.##',
+    '.......###', '#......###', '.#.....###', '##.....###', '..#....###', '#.#....###', '.##....###', '###....###',
+    '...#...###', '#..#...###', '.#.#...###', '##.#...###', '..##...###', '#.##...###', '.###...###', '####...###',
+    '....#..###', '#...#..###', '.#..#..###', '##..#..###', '..#.#..###', '#.#.#..###', '.##.#..###', '###.#..###',
+    '...##..###', '#..##..###', '.#.##..###', '##.##..###', '..###..###', '#.###..###', '.####..###', '#####..###',
+    '.....#.###', '#....#.###', '.#...#.###', '##...#.###', '..#..#.###', '#.#..#.###', '.##..#.###', '###..#.###',
+    '...#.#.###', '#..#.#.###', '.#.#.#.###', '##.#.#.###', '..##.#.###', '#.##.#.###', '.###.#.###', '####.#.###',
+    '....##.###', '#...##.###', '.#..##.###', '##..##.###', '..#.##.###', '#.#.##.###', '.##.##.###', '###.##.###',
+    '...###.###', '#..###.###', '.#.###.###', '##.###.###', '..####.###', '#.####.###', '.#####.###', '######.###',
+    '......####', '#.....####', '.#....####', '##....####', '..#...####', '#.#...####', '.##...####', '###...####',
+    '...#..####', '#..#..####', '.#.#..####', '##.#..####', '..##..####', '#.##..####', '.###..####', '####..####',
+    '....#.####', '#...#.####', '.#..#.####', '##..#.####', '..#.#.####', '#.#.#.####', '.##.#.####', '###.#.####',
+    '...##.####', '#..##.####', '.#.##.####', '##.##.####', '..###.####', '#.###.####', '.####.####', '#####.####',
+    '.....#####', '#....#####', '.#...#####', '##...#####', '..#..#####', '#.#..#####', '.##..#####', '###..#####',
+    '...#.#####', '#..#.#####', '.#.#.#####', '##.#.#####', '..##.#####', '#.##.#####', '.###.#####', '####.#####',
+    '....######', '#...######', '.#..######', '##..######', '..#.######', '#.#.######', '.##.######', '###.######',
+    '...#######', '#..#######', '.#.#######', '##.#######', '..########', '#.########', '.#########', '##########',
+]
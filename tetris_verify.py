@@ -0,0 +1,134 @@
+import sys
+import argparse
+import importlib
+import random
+from time import monotonic
+
+from tetris_core import ENGINES, MOVES
+from test_generator import CLEAR_UNITS
+
+# Differential verification of the registered engines. Seeded random games
+# are played through several engines in-process and the final heights (or
+# the exception an engine raised) compared. For a game the engines disagree
+# on, the driver finds the shortest prefix they already disagree on, whose
+# last piece is the first divergent piece, then shrinks that prefix to a
+# minimal reproducer by dropping pieces for as long as the engines still
+# disagree. Games are kept short by default so both steps stay cheap.
+
+DEFAULT_ENGINES = ['dict', 'bitboard', 'rle', 'benchmark']
+PROGRESS_SECONDS = 5.0
+BAD_TOKENS = [('X', '0'), ('Q', '9'), ('I', '7'), ('T', '-1')]
+
+def random_game(rng, max_pieces):
+    # Random valid moves, with runs that clear rows and the odd bad token
+    length = rng.randint(1, max_pieces)
+    pieces = []
+    while len(pieces) < length:
+        roll = rng.random()
+        if roll < 0.2:
+            pieces.extend((piece_entry[0], piece_entry[1:]) for piece_entry in rng.choice(CLEAR_UNITS))
+        elif roll < 0.205:
+            pieces.append(rng.choice(BAD_TOKENS))
+        else:
+            shape_letter, left_col = rng.choice(MOVES)
+            pieces.append((shape_letter, str(left_col)))
+    return pieces[:length]
+
+def play(engines, pieces):
+    results = {}
+    for name in engines:
+        try:
+            results[name] = ENGINES[name](pieces)
+        except Exception as e:
+            results[name] = f"{type(e).__name__}: {e}"
+    return results
+
+def disagree(engines, pieces):
+    return len(set(map(str, play(engines, pieces).values()))) > 1
+
+def first_divergence(engines, pieces):
+    # Length of the shortest prefix the engines disagree on
+    for length in range(1, len(pieces) + 1):
+        if disagree(engines, pieces[:length]):
+            return length
+    return len(pieces)
+
+def shrink(engines, pieces):
+    # Remove one piece at a time, latest first, while the engines disagree
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(pieces) - 1, -1, -1):
+            candidate = pieces[:i] + pieces[i + 1:]
+            if candidate and disagree(engines, candidate):
+                pieces = candidate
+                changed = True
+    return pieces
+
+def format_pieces(pieces):
+    return ','.join(shape_letter + left_col for shape_letter, left_col in pieces)
+
+def format_results(results):
+    return ' '.join(f"{name}={result}" for name, result in results.items())
+
+def report(out, game, pieces, engines):
+    length = first_divergence(engines, pieces)
+    reproducer = shrink(engines, pieces[:length])
+    out.write(f"game {game}: engines disagree\n")
+    out.write(f"  results: {format_results(play(engines, pieces))}\n")
+    out.write(f"  first divergent piece: index {length - 1} ({format_pieces(pieces[length - 1:length])})\n")
+    out.write(f"  reproducer ({len(reproducer)} pieces): {format_pieces(reproducer)}\n")
+    out.write(f"  results on reproducer: {format_results(play(engines, reproducer))}\n")
+
+def verify(engines, games, max_pieces, seed, keep_going=False, out=sys.stdout, progress=sys.stderr):
+    # Returns the number of games the engines disagreed on
+    failures = pieces_played = 0
+    started = last_report = monotonic()
+    for game in range(games):
+        rng = random.Random(f"{seed}/{game}")
+        pieces = random_game(rng, max_pieces)
+        pieces_played += len(pieces)
+        if disagree(engines, pieces):
+            failures += 1
+            report(out, game, pieces, engines)
+            if not keep_going:
+                break
+        now = monotonic()
+        if now - last_report >= PROGRESS_SECONDS:
+            progress.write(f"{game + 1} games, {pieces_played / (now - started):.0f} pieces/s\n")
+            last_report = now
+    elapsed = monotonic() - started
+    progress.write(f"{game + 1} games, {pieces_played} pieces in {elapsed:.1f}s, {failures} disagreeing\n")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Play seeded random games through several engines and compare the results")
+    parser.add_argument('--engines', nargs='+', default=DEFAULT_ENGINES, help="Registered engine names to compare (default %(default)s)")
+    parser.add_argument('--plugin', action='append', default=[], metavar='MODULE', help="Import MODULE first, so engines it registers with tetris.register_engine can be compared")
+    parser.add_argument('--games', type=int, default=10000, help="Number of games")
+    parser.add_argument('--max-pieces', type=int, default=200, help="Longest game, in pieces")
+    parser.add_argument('--seed', type=int, default=0, help="Seed; game G of seed S is always the same game")
+    parser.add_argument('--keep-going', action='store_true', help="Report every disagreeing game instead of stopping at the first")
+    args = parser.parse_args()
+    for module in args.plugin:
+        importlib.import_module(module)
+    unknown = [name for name in args.engines if name not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engines: {', '.join(unknown)} (registered: {', '.join(sorted(ENGINES))})")
+    if len(args.engines) < 2:
+        parser.error("--engines needs at least two engines")
+    if args.games < 1 or args.max_pieces < 1:
+        parser.error("--games and --max-pieces must be positive")
+    # An engine whose optional dependency is missing would otherwise show up
+    # as a disagreement in every game
+    for name in args.engines:
+        try:
+            ENGINES[name]([('Q', '0')])
+        except ImportError as e:
+            parser.error(f"engine {name} cannot load: {e}")
+
+    if verify(args.engines, args.games, args.max_pieces, args.seed, args.keep_going):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()